@@ -1,21 +1,65 @@
 """Story compilation and validation router.
 """
 
+import hashlib
+import os
 import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import wraps
 from pathlib import Path
 from flask import Blueprint, jsonify, request, abort, send_file
+from werkzeug.exceptions import HTTPException
 
 from backend.core.compiler import StoryCompiler
 from backend.core.generator import HTMLGenerator
-from backend.core.i18n import LANGUAGE_INFO
+from backend.core.i18n import LANGUAGE_INFO, get_language
 from backend.core.learning import DEFAULT_LANGUAGE, get_error_hint
-from backend.utils import sanitize_filename
+from backend.utils import is_safe_path, sanitize_filename
 
 bp = Blueprint('compile', __name__)
 play_bp = Blueprint('play', __name__)  # Separate blueprint for /play endpoint (mounted without /api prefix)
 
-# Get output directory from project root
+# Get output and stories directories from project root
 OUTPUT_DIR = Path(__file__).parent.parent.parent.parent / "output"
+STORIES_DIR = Path(__file__).parent.parent.parent.parent / "stories"
+
+# Both are stateless, so one instance serves every request
+_compiler = StoryCompiler()
+_generator = HTMLGenerator()
+
+# Compiling is CPU-bound, so only a few run at once and a few more may wait;
+# beyond that a burst of Play clicks gets a 503 instead of piling up threads.
+COMPILE_WORKERS = min(4, os.cpu_count() or 2)
+COMPILE_QUEUE_DEPTH = 8
+_compile_pool = ThreadPoolExecutor(max_workers=COMPILE_WORKERS, thread_name_prefix='compile')
+_compile_slots = threading.BoundedSemaphore(COMPILE_WORKERS + COMPILE_QUEUE_DEPTH)
+
+# Saved stories are compiled ahead of Play on a worker of their own, one at
+# a time, so background work never takes a slot or a worker from a request
+_precompile_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='precompile')
+_precompile_slots = threading.BoundedSemaphore(1)
+
+# Total characters of HTML (and error text) the compile cache may hold
+HTML_CACHE_MAX_CHARS = 32 * 1024 * 1024
+
+# Jobs still running, keyed by (function, args): an identical request joins
+# the running job instead of compiling the same story again
+_inflight_jobs: dict[tuple, Future] = {}
+_inflight_lock = threading.Lock()
+
+# Compiled files this process wrote: path -> (sha1 of the HTML, (mtime_ns, size))
+# after writing. Only the digest is kept, so evicted results aren't held here.
+_written_outputs: dict[Path, tuple[bytes, tuple[int, int]]] = {}
+
+# Returned by a result cache's lookup() when it has no entry
+_MISSING = object()
+
+# First single-quoted token in a validator message (the section it is about)
+_QUOTED_SECTION = re.compile(r"'([^']+)'")
+# Anything that can't appear in a compiled story name
+_UNSAFE_STORY_NAME_CHARS = re.compile(r'[^a-zA-Z0-9_.-]')
 
 
 def _resolve_language(data: dict) -> str:
@@ -31,7 +75,7 @@ def _to_error_detail(message: str, lang: str = DEFAULT_LANGUAGE) -> dict:
     the child should look at, so the UI can highlight it. A child-friendly
     ``hint`` is added for known messages (``None`` when unrecognised).
     """
-    match = re.search(r"'([^']+)'", message)
+    match = _QUOTED_SECTION.search(message)
     return {
         "message": message,
         "section": match.group(1) if match else None,
@@ -39,60 +83,308 @@ def _to_error_detail(message: str, lang: str = DEFAULT_LANGUAGE) -> dict:
     }
 
 
-@bp.route("/compile", methods=["POST"])
-def compile_story():
-    """Compile story to HTML."""
-    data = request.get_json()
-    if not data:
-        return jsonify({'success': False, 'error': 'No JSON data provided'})
+def _content_key(content: str, *args) -> tuple:
+    """Cache key for a story: a digest of its text instead of the text itself.
     
-    content = data.get('content', '')
-    filename = data.get('filename', '')
+    Stories can be up to 10 MB, so keeping each cached text as its own key
+    would hold far more memory than the results do.
+    """
+    digest = hashlib.blake2b(content.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+    return (digest, *args)
+
+
+def _result_size(result) -> int:
+    """Rough size of a cached result: the characters in its strings."""
+    if isinstance(result, str):
+        return len(result)
+    if isinstance(result, tuple):
+        return sum(_result_size(item) for item in result)
+    return 0
+
+
+def _result_cache(maxsize: int, max_chars: int | None = None, key=lambda *args: args):
+    """Memoize a compile function in a lock-guarded LRU dict.
+    
+    Works like functools.lru_cache, but the wrapper also has a
+    ``lookup(*args)`` that returns a remembered result (or ``_MISSING``)
+    without calling the function. Request threads use it to answer a repeat
+    click at once, without taking a compile slot or queueing behind other
+    compiles.
+    
+    Args:
+        maxsize: Most results to keep
+        max_chars: Cap on the characters held across all results; a result
+            larger than this on its own is returned but not kept
+        key: Builds the cache key from the call's arguments
+    """
+    def decorate(fn):
+        results: OrderedDict[tuple, tuple[object, int]] = OrderedDict()
+        total = 0
+        lock = threading.Lock()
+        
+        def lookup(*args):
+            cache_key = key(*args)
+            with lock:
+                if cache_key not in results:
+                    return _MISSING
+                results.move_to_end(cache_key)
+                return results[cache_key][0]
+        
+        def cache_clear():
+            nonlocal total
+            with lock:
+                results.clear()
+                total = 0
+        
+        @wraps(fn)
+        def wrapper(*args):
+            nonlocal total
+            result = lookup(*args)
+            if result is not _MISSING:
+                return result
+            
+            result = fn(*args)
+            size = _result_size(result)
+            if max_chars is not None and size > max_chars:
+                return result
+            
+            cache_key = key(*args)
+            with lock:
+                if cache_key in results:
+                    total -= results.pop(cache_key)[1]
+                results[cache_key] = (result, size)
+                total += size
+                while len(results) > maxsize or (max_chars is not None and total > max_chars):
+                    total -= results.popitem(last=False)[1][1]
+            return result
+        
+        wrapper.lookup = lookup
+        wrapper.cache_clear = cache_clear
+        return wrapper
+    return decorate
+
+
+def _submit_compile_job(fn, *args, background: bool = False) -> Future | None:
+    """Start fn(*args) on the compile pool, or join the identical running job.
+    
+    ``background`` jobs go to the precompile worker instead. Either kind
+    joins an identical running job of the other kind.
+    
+    Returns None when every slot of the chosen pool is taken.
+    """
+    key = (fn, args)
+    with _inflight_lock:
+        future = _inflight_jobs.get(key)
+        if future is not None:
+            return future
+        
+        if background:
+            pool, slots = _precompile_pool, _precompile_slots
+        else:
+            pool, slots = _compile_pool, _compile_slots
+        if not slots.acquire(blocking=False):
+            return None
+        future = pool.submit(fn, *args)
+        _inflight_jobs[key] = future
+    
+    def finished(done: Future) -> None:
+        with _inflight_lock:
+            if _inflight_jobs.get(key) is done:
+                del _inflight_jobs[key]
+        slots.release()
+    
+    future.add_done_callback(finished)
+    return future
+
+
+def _run_compile_job(fn, *args):
+    """Return fn's cached result, or run it on the compile pool and wait.
+    
+    fn must be wrapped with ``_result_cache``. Aborts with 503 when the
+    result isn't cached and the pool is full.
+    """
+    result = fn.lookup(*args)
+    if result is not _MISSING:
+        return result
+    
+    future = _submit_compile_job(fn, *args)
+    if future is None:
+        abort(503, description="Too many stories are being compiled, try again")
+    return future.result()
+
+
+def precompile_story(content: str) -> Future | None:
+    """Compile a just-saved story in the background to warm the cache.
+    
+    Saving usually comes right before Play, so the HTML is ready by the time
+    the child presses it, or Play joins the compile still running. Runs on
+    the precompile worker, never in a request's compile slot. Skipped
+    (returning None) when the result is already cached or another story is
+    being precompiled.
+    
+    Args:
+        content: The story as Play will read it back from disk
+    """
+    lang = get_language()
+    if _build_story_html.lookup(content, lang) is not _MISSING:
+        return None
+    return _submit_compile_job(_build_story_html, content, lang, background=True)
+
+
+def _parse_and_validate(content: str):
+    """Parse a story and return it with its validation errors."""
+    story = _compiler.parse(content)
+    return story, _compiler.validate(story)
+
+
+@_result_cache(maxsize=16, key=_content_key)
+def _validation_summary(content: str) -> tuple[tuple[str, ...], int, str, str | None]:
+    """Validate a story, remembering the last few results.
+    
+    Children often press Validate again without editing; the answer only
+    depends on the text, so repeats skip parsing. Keyed by a digest of the
+    text, so the cache never holds the stories themselves.
+    
+    Returns:
+        (errors, section count, title, author)
+    """
+    story, errors = _parse_and_validate(content)
+    return tuple(errors), len(story.sections), story.metadata.title, story.metadata.author
+
+
+@_result_cache(maxsize=64, max_chars=HTML_CACHE_MAX_CHARS, key=_content_key)
+def _build_story_html(content: str, lang: str) -> tuple[tuple[str, ...], str | None]:
+    """Parse, validate and render a story, remembering recent results.
+    
+    The HTML depends only on the text and the generator's language (which
+    ``lang`` carries into the cache key), so clicking Compile & Play again
+    on an unchanged story skips the whole pipeline. Results are keyed by a
+    digest of the text and capped in total size.
+    
+    Returns:
+        (errors, html): the validation errors, and the HTML when there are none
+    """
+    story, errors = _parse_and_validate(content)
+    if errors:
+        return tuple(errors), None
+    return (), _generator.generate(story, base_path=STORIES_DIR)
+
+
+def _write_output(html_path: Path, html_content: str) -> None:
+    """Write compiled HTML, skipping the write when the file already holds it.
+    
+    A matching digest plus a matching stat tells us the file on disk is
+    still the one we wrote. Leaving it alone also keeps its mtime, so the
+    player's ETag stays valid.
+    """
+    data = html_content.encode('utf-8')
+    digest = hashlib.sha1(data).digest()
+    try:
+        stat = html_path.stat()
+    except FileNotFoundError:
+        stat = None
+    written = _written_outputs.get(html_path)
+    if stat and written and written == (digest, (stat.st_mtime_ns, stat.st_size)):
+        return
+    
+    with open(html_path, 'wb') as f:
+        f.write(data)
+    stat = html_path.stat()
+    _written_outputs[html_path] = (digest, (stat.st_mtime_ns, stat.st_size))
+
+
+def _compile_to_output(content: str, filename: str) -> dict:
+    """Parse, validate and render a story into OUTPUT_DIR.
     
+    Returns the JSON body shared by /api/compile and /api/play: either
+    ``success`` with a ``play_url``, or the validation ``errors``.
+    """
     try:
         # Sanitize filename and convert to HTML filename
         story_name = sanitize_filename(filename, extension='', default='story')
         story_name = story_name.replace('.txt', '')
         
-        # Parse and validate
-        compiler = StoryCompiler()
-        story = compiler.parse(content)
-        errors = compiler.validate(story)
+        # Parse, validate and generate HTML (or reuse a recent result)
+        errors, html_content = _run_compile_job(_build_story_html, content, get_language())
         
         if errors:
-            return jsonify({
+            return {
                 'success': False,
-                'errors': errors
-            })
-        
-        # Generate HTML (use stories/ as base path for image resolution)
-        generator = HTMLGenerator()
-        stories_dir = Path(__file__).parent.parent.parent.parent / "stories"
-        html_content = generator.generate(story, base_path=stories_dir)
+                'errors': list(errors)
+            }
         
         # Save to output directory
         OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-        html_path = OUTPUT_DIR / f"{story_name}.html"
+        _write_output(OUTPUT_DIR / f"{story_name}.html", html_content)
         
-        with open(html_path, 'w', encoding='utf-8') as f:
-            f.write(html_content)
-        
-        return jsonify({
+        return {
             'success': True,
             'message': 'Story compiled successfully',
             'play_url': f'/play/{story_name}'
-        })
+        }
+    except HTTPException:
+        raise
     except Exception as e:
-        return jsonify({
+        return {
             'success': False,
             'error': str(e)
-        })
+        }
+
+
+@bp.route("/compile", methods=["POST"])
+def compile_story():
+    """Compile story to HTML."""
+    data = request.get_json(cache=False)
+    if not data:
+        return jsonify({'success': False, 'error': 'No JSON data provided'})
+    
+    content = data.get('content', '')
+    filename = data.get('filename', '')
+    
+    return jsonify(_compile_to_output(content, filename))
+
+
+@bp.route("/play", methods=["POST"])
+def play_saved_story():
+    """Compile a saved story by filename.
+    
+    Reads the story on the server so the library's Play button needs one
+    round-trip instead of fetching the content and posting it back.
+    """
+    data = request.get_json(cache=False)
+    if not data:
+        abort(400, description="No JSON data provided")
+    
+    filename = data.get('filename', '')
+    if not filename:
+        abort(400, description="No filename provided")
+    
+    is_safe, story_path = is_safe_path(STORIES_DIR, filename)
+    if not is_safe:
+        abort(403, description="Invalid file path")
+    
+    # Only stories; images and other files under stories/ aren't playable
+    if not filename.endswith('.txt'):
+        abort(400, description="Only .txt stories can be played")
+    
+    if not story_path.is_file():
+        abort(404, description=f"Story not found: {filename}")
+    
+    try:
+        with open(story_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+    except UnicodeDecodeError:
+        abort(400, description="Story must be UTF-8 text")
+    except Exception as e:
+        abort(500, description=f"Error reading story: {str(e)}")
+    
+    return jsonify(_compile_to_output(content, filename))
 
 
 @bp.route("/validate", methods=["POST"])
 def validate_story():
     """Validate story structure."""
-    data = request.get_json()
+    data = request.get_json(cache=False)
     if not data:
         return jsonify({
             'valid': False,
@@ -103,18 +395,18 @@ def validate_story():
     lang = _resolve_language(data)
 
     try:
-        compiler = StoryCompiler()
-        story = compiler.parse(content)
-        errors = compiler.validate(story)
+        errors, sections, title, author = _run_compile_job(_validation_summary, content)
         
         return jsonify({
             'valid': len(errors) == 0,
-            'errors': errors,
+            'errors': list(errors),
             'error_details': [_to_error_detail(e, lang) for e in errors],
-            'sections': len(story.sections),
-            'title': story.metadata.title,
-            'author': story.metadata.author
+            'sections': sections,
+            'title': title,
+            'author': author
         })
+    except HTTPException:
+        raise
     except Exception as e:
         return jsonify({
             'valid': False,
@@ -123,30 +415,30 @@ def validate_story():
         })
 
 
+def _find_compiled_story(safe_name: str) -> Path | None:
+    """Locate a compiled story, tolerating hyphen/underscore differences."""
+    for name in (safe_name, safe_name.replace('-', '_'), safe_name.replace('_', '-')):
+        html_path = OUTPUT_DIR / f"{name}.html"
+        if html_path.exists():
+            return html_path
+    return None
+
+
 @play_bp.route("/play/<story_name>")
 def serve_compiled_story(story_name: str):
-    """Serve a compiled HTML story."""
+    """Serve a compiled HTML story.
+    
+    Responses carry an ETag and Last-Modified from the output file and are
+    marked no-cache, so a reopened story revalidates with a cheap 304 while
+    a recompile is picked up immediately.
+    """
     # Basic sanitization - remove path traversal and dangerous chars
     # but keep the story name intact for file lookup
     safe_name = story_name.replace('../', '').replace('..\\', '').replace('/', '').replace('\\', '')
-    safe_name = re.sub(r'[^a-zA-Z0-9_.-]', '', safe_name)
+    safe_name = _UNSAFE_STORY_NAME_CHARS.sub('', safe_name)
     
-    # Try to find the HTML file with various name formats
-    html_path = OUTPUT_DIR / f"{safe_name}.html"
-    
-    if not html_path.exists():
-        # Try replacing hyphens with underscores
-        alt_name = safe_name.replace('-', '_')
-        alt_html_path = OUTPUT_DIR / f"{alt_name}.html"
-        if alt_html_path.exists():
-            return send_file(alt_html_path, mimetype="text/html")
-        
-        # Try replacing underscores with hyphens
-        alt_name2 = safe_name.replace('_', '-')
-        alt_html_path2 = OUTPUT_DIR / f"{alt_name2}.html"
-        if alt_html_path2.exists():
-            return send_file(alt_html_path2, mimetype="text/html")
-        
+    html_path = _find_compiled_story(safe_name)
+    if html_path is None:
         abort(404, description=f"Compiled story not found: {safe_name}")
     
-    return send_file(html_path, mimetype="text/html")
+    return send_file(html_path, mimetype="text/html", conditional=True, etag=True, max_age=0)
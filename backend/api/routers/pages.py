@@ -2,12 +2,44 @@
 Page rendering router - serves Jinja2 templates.
 """
 
-from flask import Blueprint, render_template
+import gzip
+import hashlib
+
+from flask import Blueprint, Response, current_app, render_template, request
+
+from backend.utils import accepts_gzip
 
 bp = Blueprint('pages', __name__)
 
+# Rendered index page as (encoded body, gzipped body, etag). The template
+# has no per-request data, so it only needs rendering once per process.
+_index_cache: tuple[bytes, bytes, str] | None = None
+
+
+def _render_index() -> tuple[bytes, bytes, str]:
+    """Render the index page once, re-rendering only while templates auto-reload."""
+    global _index_cache
+    if _index_cache is None or current_app.jinja_env.auto_reload:
+        body = render_template("index.html").encode('utf-8')
+        _index_cache = (
+            body,
+            gzip.compress(body, compresslevel=9),
+            hashlib.sha256(body).hexdigest()[:32],
+        )
+    return _index_cache
+
 
 @bp.route("/")
 def index():
     """Render main page (shows all three tabs)."""
-    return render_template("index.html")
+    body, gzipped, etag = _render_index()
+    if accepts_gzip():
+        response = Response(gzipped, mimetype="text/html")
+        response.headers['Content-Encoding'] = 'gzip'
+        response.set_etag(etag, weak=True)
+    else:
+        response = Response(body, mimetype="text/html")
+        response.set_etag(etag)
+    response.vary.add('Accept-Encoding')
+    response.cache_control.no_cache = True  # Always revalidate, usually a 304
+    return response.make_conditional(request)
@@ -1,9 +1,15 @@
 """Story CRUD operations router.
 """
 
+import codecs
+import hashlib
+import os
+import uuid
 from pathlib import Path
-from flask import Blueprint, jsonify, request, abort
+from flask import Blueprint, Response, jsonify, request, abort
+from werkzeug.exceptions import HTTPException
 
+from backend.api.routers.compile_router import precompile_story
 from backend.core.compiler import StoryCompiler
 from backend.utils import is_safe_path, sanitize_filename
 
@@ -14,34 +20,104 @@ STORIES_DIR = Path(__file__).parent.parent.parent.parent / "stories"
 OUTPUT_DIR = Path(__file__).parent.parent.parent.parent / "output"
 
 
+# Stateless, so one instance serves every request
+_compiler = StoryCompiler()
+
+# Raw uploads are copied to disk in blocks of this size
+SAVE_CHUNK_SIZE = 64 * 1024
+
+# Flags for a raw upload's temporary file: a new file (never an existing
+# one), and no newline translation on Windows
+_PART_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0)
+
+# Story list entries keyed by filename, tagged with the (mtime, size) they
+# were built from so an edited file is re-parsed on the next listing.
+_story_cache: dict[str, tuple[tuple[int, int], dict]] = {}
+
+
+def _story_summary(story_path: str | os.PathLike, stat: os.stat_result | None = None,
+                   content: str | None = None) -> dict:
+    """Return the library entry for a story file, re-parsing only if it changed.
+    
+    ``content`` is the file's text when the caller already has it.
+    """
+    if stat is None:
+        stat = os.stat(story_path)
+    name = os.path.basename(story_path)
+    key = (stat.st_mtime_ns, stat.st_size)
+    cached = _story_cache.get(name)
+    if cached and cached[0] == key:
+        return cached[1]
+
+    try:
+        if content is None:
+            with open(story_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+        
+        story = _compiler.parse(content)
+        summary = {
+            'filename': name,
+            'title': story.metadata.title,
+            'author': story.metadata.author,
+            'sections': len(story.sections)
+        }
+    except Exception as e:
+        summary = {
+            'filename': name,
+            'title': os.path.splitext(name)[0].replace('_', ' ').title(),
+            'author': 'Unknown',
+            'error': str(e)
+        }
+    
+    _story_cache[name] = (key, summary)
+    return summary
+
+
 @bp.route("/stories")
 def list_stories():
-    """List all available stories with metadata."""
+    """List all available stories with metadata.
+    
+    The ETag covers each listed file's name, mtime and size, the same things
+    the cached entries are keyed on, so an unchanged library revalidates
+    with a 304 and nothing is serialized.
+    """
     stories = []
+    listed = set()
+    fingerprint = hashlib.sha1()
     
-    if STORIES_DIR.exists():
-        for story_file in STORIES_DIR.glob('*.txt'):
-            try:
-                with open(story_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                compiler = StoryCompiler()
-                story = compiler.parse(content)
-                stories.append({
-                    'filename': story_file.name,
-                    'title': story.metadata.title,
-                    'author': story.metadata.author,
-                    'sections': len(story.sections)
-                })
-            except Exception as e:
-                stories.append({
-                    'filename': story_file.name,
-                    'title': story_file.stem.replace('_', ' ').title(),
-                    'author': 'Unknown',
-                    'error': str(e)
-                })
-    
-    return jsonify(stories)
+    try:
+        # scandir gives the file type without a stat, and one stat per story
+        entries = os.scandir(STORIES_DIR)
+    except FileNotFoundError:
+        entries = None
+    
+    if entries is not None:
+        with entries:
+            for entry in entries:
+                if not entry.name.endswith('.txt'):
+                    continue
+                try:
+                    if entry.is_file():
+                        stat = entry.stat()
+                        stories.append(_story_summary(entry.path, stat))
+                        listed.add(entry.name)
+                        fingerprint.update(f"{entry.name}:{stat.st_mtime_ns}:{stat.st_size}/".encode())
+                except OSError:
+                    # File vanished between listing and stat
+                    continue
+    
+    # Forget stories that were removed behind our back
+    for name in _story_cache.keys() - listed:
+        _story_cache.pop(name, None)
+    
+    etag = fingerprint.hexdigest()[:32]
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+    else:
+        response = jsonify(stories)
+    response.set_etag(etag)
+    response.cache_control.no_cache = True
+    return response
 
 
 @bp.route("/story/<path:filename>")
@@ -55,22 +131,67 @@ def get_story_content(filename: str):
         abort(404, description=f"Story not found: {filename}")
     
     try:
-        with open(story_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        return jsonify({'content': content, 'filename': filename})
+        # Unchanged file: answer the browser's revalidation without reading it
+        stat = story_path.stat()
+        etag = f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
+        if request.if_none_match.contains_weak(etag):
+            response = Response(status=304)
+        else:
+            with open(story_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+            response = jsonify({'content': content, 'filename': filename})
+        response.set_etag(etag)
+        response.cache_control.no_cache = True
+        return response
     except Exception as e:
         abort(500, description=f"Error reading story: {str(e)}")
 
 
+def _write_story_stream(stream, story_path: Path) -> None:
+    """Copy a UTF-8 text upload to story_path without holding it in memory.
+    
+    The body is written to a hidden temporary file next to the story and
+    only replaces it once complete, so a broken or non-UTF-8 upload never
+    truncates the existing story.
+    
+    Raises:
+        UnicodeDecodeError: If the body is not valid UTF-8
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    # A random name can't collide between threads or worker processes, and
+    # mode 0o666 gives the story the same permissions a plain open() would
+    part_path = story_path.with_name(f'.{story_path.name}.{uuid.uuid4().hex}.part')
+    fd = os.open(part_path, _PART_FLAGS, 0o666)
+    try:
+        with open(fd, 'wb') as f:
+            while chunk := stream.read(SAVE_CHUNK_SIZE):
+                decoder.decode(chunk)
+                f.write(chunk)
+            decoder.decode(b'', final=True)
+        os.replace(part_path, story_path)
+    finally:
+        part_path.unlink(missing_ok=True)
+
+
 @bp.route("/save", methods=["POST"])
 def save_story():
-    """Save story to file."""
-    data = request.get_json()
-    if not data:
-        abort(400, description="No JSON data provided")
+    """Save story to file.
     
-    content = data.get('content', '')
-    filename = data.get('filename', '')
+    Takes JSON ``{content, filename}``, or the story itself as an
+    application/octet-stream body with ``?filename=``, which is streamed to
+    disk in chunks. Neither is a CORS "simple" content type, so a page on
+    another origin can't post one without a preflight, which we never grant.
+    """
+    if request.mimetype == 'application/octet-stream':
+        content = None
+        filename = request.args.get('filename', '')
+    else:
+        data = request.get_json(cache=False)
+        if not data:
+            abort(400, description="No JSON data provided")
+        
+        content = data.get('content', '')
+        filename = data.get('filename', '')
     
     if not filename:
         abort(400, description="No filename provided")
@@ -84,14 +205,35 @@ def save_story():
     try:
         STORIES_DIR.mkdir(parents=True, exist_ok=True)
         
-        with open(story_path, 'w', encoding='utf-8') as f:
-            f.write(content)
+        if content is None:
+            _write_story_stream(request.stream, story_path)
+            # Read back once; the summary and the precompile share it
+            with open(story_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+        else:
+            with open(story_path, 'w', encoding='utf-8') as f:
+                f.write(content)
+            # What reading the file back would return (universal newlines),
+            # so the precompile's cache key matches Play's
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
+        
+        # A same-size rewrite within the filesystem's mtime resolution would
+        # look unchanged, so always rebuild the entry for the saved file
+        _story_cache.pop(story_path.name, None)
+        precompile_story(content)
         
         return jsonify({
             'success': True,
             'message': f'Story saved as {filename}',
-            'filename': filename
+            'filename': filename,
+            # Library entry for the saved file, so clients can patch their
+            # story list instead of re-fetching all of /api/stories
+            'story': _story_summary(story_path, content=content)
         })
+    except UnicodeDecodeError:
+        abort(400, description="Story must be UTF-8 text")
+    except HTTPException:
+        raise
     except Exception as e:
         abort(500, description=str(e))
 
@@ -99,7 +241,7 @@ def save_story():
 @bp.route("/delete", methods=["POST"])
 def delete_story():
     """Delete a story file."""
-    data = request.get_json()
+    data = request.get_json(cache=False)
     if not data:
         abort(400, description="No JSON data provided")
     
@@ -117,6 +259,7 @@ def delete_story():
     
     try:
         story_path.unlink()
+        _story_cache.pop(story_path.name, None)
         return jsonify({
             'success': True,
             'message': f'Story {filename} deleted'
@@ -107,7 +107,7 @@ def create_new_story():
     - filename: Sanitized filename
     - message: Success message
     """
-    data = request.get_json()
+    data = request.get_json(cache=False)
     if not data:
         abort(400, description="No JSON data provided")
     
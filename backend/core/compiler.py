@@ -9,6 +9,23 @@ import re
 from dataclasses import dataclass, field
 from typing import List, Optional
 
+# Patterns used on every parse, compiled once
+# Metadata block at the top of the story: ---\n...\n---
+_METADATA_BLOCK = re.compile(r'^---\s*\n(.*?)\n---', re.DOTALL)
+_METADATA_BLOCK_WITH_NEWLINE = re.compile(r'^---\s*\n.*?\n---\s*\n', re.DOTALL)
+# Separator line between sections
+_SECTION_SEPARATOR = re.compile(r'\n---\s*\n')
+# Section header line: [[name]]
+_SECTION_HEADER = re.compile(r'^\[\[([^\]]+)\]\]$')
+# Story syntax, also used by the HTML generator
+# [[text]] or [[text|target]]
+CHOICE_PATTERN = re.compile(r'\[\[([^\]|]+)(?:\|([^\]]+))?\]\]')
+# ![alt text](path)
+IMAGE_PATTERN = re.compile(r'!\[([^\]]*)\]\(([^\)]+)\)')
+# Section name normalization
+_NAME_SEPARATORS = re.compile(r'[\s_]+')
+_NAME_INVALID_CHARS = re.compile(r'[^a-z0-9-]')
+
 
 class ValidationError(Exception):
     """Raised when story validation fails."""
@@ -90,7 +107,7 @@ class StoryCompiler:
     def _parse_metadata(self, content: str) -> StoryMetadata:
         """Extract metadata from the story header."""
         # Match metadata block: ---\n...metadata...\n---
-        metadata_match = re.match(r'^---\s*\n(.*?)\n---', content, re.DOTALL)
+        metadata_match = _METADATA_BLOCK.match(content)
         
         if not metadata_match:
             raise ValidationError("No metadata block found. Story must start with ---\\nmetadata\\n---")
@@ -116,10 +133,10 @@ class StoryCompiler:
     def _parse_sections(self, content: str) -> List[Section]:
         """Parse all sections from the story."""
         # Remove metadata block
-        content_without_metadata = re.sub(r'^---\s*\n.*?\n---\s*\n', '', content, count=1, flags=re.DOTALL)
+        content_without_metadata = _METADATA_BLOCK_WITH_NEWLINE.sub('', content, count=1)
         
         # Split by section separators (---), but keep the content
-        raw_sections = re.split(r'\n---\s*\n', content_without_metadata)
+        raw_sections = _SECTION_SEPARATOR.split(content_without_metadata)
         
         sections = []
         seen_names = set()
@@ -146,7 +163,7 @@ class StoryCompiler:
         
         # First line should be section header [[name]] (no colon for simplicity)
         header_line = lines[0].strip()
-        header_match = re.match(r'^\[\[([^\]]+)\]\]$', header_line)
+        header_match = _SECTION_HEADER.match(header_line)
         
         if not header_match:
             raise ValidationError(f"Invalid section header: {header_line}. Expected [[section name]]")
@@ -174,9 +191,9 @@ class StoryCompiler:
         """Normalize section name to lowercase with hyphens."""
         # Convert to lowercase and replace spaces/underscores with hyphens
         normalized = name.lower()
-        normalized = re.sub(r'[\s_]+', '-', normalized)
+        normalized = _NAME_SEPARATORS.sub('-', normalized)
         # Remove any non-alphanumeric characters except hyphens
-        normalized = re.sub(r'[^a-z0-9-]', '', normalized)
+        normalized = _NAME_INVALID_CHARS.sub('', normalized)
         return normalized
 
     def _extract_choices(self, content: str) -> List[Choice]:
@@ -184,9 +201,7 @@ class StoryCompiler:
         choices = []
         
         # Match [[text]] or [[text|target]]
-        choice_pattern = r'\[\[([^\]|]+)(?:\|([^\]]+))?\]\]'
-        
-        for match in re.finditer(choice_pattern, content):
+        for match in CHOICE_PATTERN.finditer(content):
             text = match.group(1).strip()
             target = match.group(2).strip() if match.group(2) else None
             
@@ -205,9 +220,7 @@ class StoryCompiler:
         images = []
         
         # Match ![alt text](path)
-        image_pattern = r'!\[([^\]]*)\]\(([^\)]+)\)'
-        
-        for match in re.finditer(image_pattern, content):
+        for match in IMAGE_PATTERN.finditer(content):
             alt_text = match.group(1).strip()
             path = match.group(2).strip()
             images.append(Image(alt_text=alt_text, path=path))
@@ -226,8 +239,8 @@ class StoryCompiler:
         """
         errors = []
         
-        # Build set of all section names
-        section_names = {section.name for section in story.sections}
+        # Index sections by name once; also serves as the set of names
+        section_names = {section.name: section for section in story.sections}
         
         # Check that start section exists
         if story.metadata.start_section and story.metadata.start_section not in section_names:
@@ -236,7 +249,7 @@ class StoryCompiler:
         # Track which sections are reachable
         reachable = set()
         if story.metadata.start_section:
-            self._mark_reachable(story.metadata.start_section, story.sections, reachable)
+            self._mark_reachable(story.metadata.start_section, section_names, reachable)
         
         # Check all choices point to valid sections
         for section in story.sections:
@@ -257,18 +270,18 @@ class StoryCompiler:
         
         return errors
 
-    def _mark_reachable(self, section_name: str, sections: List[Section], reachable: set):
-        """Recursively mark sections as reachable."""
-        if section_name in reachable:
-            return  # Already visited
-        
-        reachable.add(section_name)
+    def _mark_reachable(self, section_name: str, sections: dict[str, Section], reachable: set):
+        """Mark every section reachable from section_name.
         
-        # Find this section
-        section = next((s for s in sections if s.name == section_name), None)
-        if not section:
-            return
-        
-        # Mark all targets as reachable
-        for choice in section.choices:
-            self._mark_reachable(choice.target, sections, reachable)
+        Iterative, so long chains of sections can't hit the recursion limit.
+        """
+        pending = [section_name]
+        while pending:
+            name = pending.pop()
+            if name in reachable:
+                continue  # Already visited
+            reachable.add(name)
+            
+            section = sections.get(name)
+            if section:
+                pending.extend(choice.target for choice in section.choices)
@@ -4,11 +4,10 @@ HTML/CSS/JS generator.
 Generates playable HTML files from parsed story data.
 """
 
-import re
 from pathlib import Path
 from typing import Optional
 import mistune
-from .compiler import Story
+from .compiler import Story, CHOICE_PATTERN, IMAGE_PATTERN
 from .templates import HTML_TEMPLATE, CSS_TEMPLATE, JAVASCRIPT_TEMPLATE
 from .i18n import get_language
 
@@ -16,6 +15,15 @@ from .i18n import get_language
 class HTMLGenerator:
     """Generates HTML output from parsed story data."""
     
+    def __init__(self):
+        # Build the mistune parser once; creating it sets up the block,
+        # inline and plugin rules, which used to happen for every section.
+        # strikethrough enables ~~text~~ syntax.
+        self._markdown = mistune.create_markdown(
+            escape=False,  # Don't escape HTML (we control the input)
+            plugins=['strikethrough', 'table', 'url']  # GFM features
+        )
+    
     def generate(self, story: Story, base_path: Optional[Path] = None) -> str:
         """
         Generate complete HTML document from story data.
@@ -97,17 +105,10 @@ class HTMLGenerator:
         """
         # Remove choice syntax [[text]] or [[text|target]] before processing
         # This is our custom story navigation syntax
-        text = re.sub(r'\[\[([^\]|]+)(?:\|([^\]]+))?\]\]', '', text)
-        
-        # Create mistune markdown parser with GitHub Flavored Markdown features
-        # strikethrough=True enables ~~text~~ syntax
-        markdown_parser = mistune.create_markdown(
-            escape=False,  # Don't escape HTML (we control the input)
-            plugins=['strikethrough', 'table', 'url']  # GFM features
-        )
+        text = CHOICE_PATTERN.sub('', text)
         
         # Convert markdown to HTML
-        html = markdown_parser(text)
+        html = self._markdown(text)
         
         # Mistune wraps everything in <p> tags, which is what we want
         return html.strip()
@@ -123,7 +124,7 @@ class HTMLGenerator:
             return f'<img src="{image_path}" alt="{alt_text}" />'
         
         # Replace markdown images with HTML img tags
-        html = re.sub(r'!\[([^\]]*)\]\(([^\)]+)\)', replace_image, html)
+        html = IMAGE_PATTERN.sub(replace_image, html)
         
         return html
     
@@ -4,8 +4,10 @@ Serves Jinja2 templates with modular CSS/JS, reusing existing core modules.
 """
 
 from pathlib import Path
-from flask import Flask, jsonify
+from flask import Flask, jsonify, request
+from werkzeug.security import safe_join
 from backend.api.routers import stories, compile_router, i18n, pages, template, learning
+from backend.utils import compress_response, compress_static_response, install_json_provider
 
 # Create Flask app
 backend_dir = Path(__file__).parent
@@ -18,6 +20,13 @@ app = Flask(
 
 # Configure app
 app.config['JSON_SORT_KEYS'] = False
+install_json_provider(app)  # orjson when installed, stdlib json otherwise
+# Refuse bodies over 10 MB from the Content-Length header, before reading them
+app.config['MAX_CONTENT_LENGTH'] = 10 * 1024 * 1024
+
+# Versioned static URLs (?v=<mtime>) never change content, so browsers may
+# keep them for a year without revalidating.
+STATIC_MAX_AGE = 365 * 24 * 60 * 60
 
 app.register_blueprint(pages.bp)
 app.register_blueprint(stories.bp, url_prefix="/api")
@@ -39,6 +48,48 @@ def add_security_headers(response):
     return response
 
 
+@app.url_defaults
+def add_static_version(endpoint, values):
+    """Append the file's mtime to static URLs so edits change the URL.
+    
+    Nanoseconds, not seconds: two edits within one second must still get
+    different URLs, since browsers keep each URL for a year.
+    """
+    if endpoint == "static" and "filename" in values:
+        try:
+            mtime_ns = (Path(app.static_folder) / values["filename"]).stat().st_mtime_ns
+        except OSError:
+            return
+        values.setdefault("v", f"{mtime_ns:x}")
+
+
+@app.after_request
+def cache_versioned_static(response):
+    """Mark versioned static assets as cacheable forever."""
+    if request.endpoint == "static" and "v" in request.args and response.status_code == 200:
+        response.cache_control.no_cache = None
+        response.cache_control.public = True
+        response.cache_control.max_age = STATIC_MAX_AGE
+        response.cache_control.immutable = True
+    return response
+
+
+@app.after_request
+def compress_static_assets(response):
+    """Gzip CSS, JS and SVG files, compressing each version only once."""
+    if request.endpoint == "static" and request.view_args:
+        path = safe_join(app.static_folder, request.view_args["filename"])
+        if path:
+            compress_static_response(response, path)
+    return response
+
+
+@app.after_request
+def compress_dynamic_responses(response):
+    """Gzip JSON and HTML bodies for clients that accept it."""
+    return compress_response(response)
+
+
 @app.route("/health")
 def health_check():
     """Health check endpoint."""
@@ -47,9 +98,10 @@ def health_check():
 
 if __name__ == "__main__":
     # Development server only - use gunicorn for production:
-    # gunicorn backend.main:app --bind 0.0.0.0:8001 --workers 4
+    # gunicorn backend.main:app --bind 0.0.0.0:8001 --workers 2 --threads 4
     app.run(
         host="127.0.0.1",  # Only bind to localhost for development
         port=8001,
-        debug=True  # nosec B201 - debug mode only for local development
+        debug=True,  # nosec B201 - debug mode only for local development
+        threaded=True  # A slow compile must not stall /api/stories polls
     )
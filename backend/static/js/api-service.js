@@ -9,16 +9,32 @@
 class ApiService {
     constructor(baseUrl = '') {
         this.baseUrl = baseUrl;
+        // kind of request -> AbortController of the one in flight
+        this._controllers = new Map();
     }
 
     /**
      * Generic fetch wrapper with error handling
      * @private
+     * @param {string} endpoint - Path of the API endpoint
+     * @param {Object} options - fetch() options
+     * @param {string|null} supersedes - Kind of request; starting another of
+     *     the same kind aborts this one, whose answer would be stale. The
+     *     aborted call rejects with an AbortError.
      */
-    async _fetch(endpoint, options = {}) {
+    async _fetch(endpoint, options = {}, supersedes = null) {
+        let controller = null;
+        if (supersedes) {
+            const previous = this._controllers.get(supersedes);
+            if (previous) previous.abort();
+            controller = new AbortController();
+            this._controllers.set(supersedes, controller);
+        }
+
         try {
             const response = await fetch(`${this.baseUrl}${endpoint}`, {
                 ...options,
+                signal: controller ? controller.signal : undefined,
                 headers: {
                     'Content-Type': 'application/json',
                     ...options.headers
@@ -31,8 +47,14 @@ class ApiService {
 
             return await response.json();
         } catch (error) {
-            console.error(`API Error [${endpoint}]:`, error);
+            if (error.name !== 'AbortError') {
+                console.error(`API Error [${endpoint}]:`, error);
+            }
             throw error;
+        } finally {
+            if (controller && this._controllers.get(supersedes) === controller) {
+                this._controllers.delete(supersedes);
+            }
         }
     }
 
@@ -62,9 +84,12 @@ class ApiService {
      * @returns {Promise<Object>} Save result
      */
     async saveStory(content, filename) {
-        return this._fetch('/api/save', {
+        // Sent raw so the server can stream it straight to disk. Not text/plain:
+        // that would let other sites post saves without a CORS preflight.
+        return this._fetch(`/api/save?filename=${encodeURIComponent(filename)}`, {
             method: 'POST',
-            body: JSON.stringify({ content, filename })
+            headers: { 'Content-Type': 'application/octet-stream' },
+            body: content
         });
     }
 
@@ -90,7 +115,7 @@ class ApiService {
         return this._fetch('/api/validate', {
             method: 'POST',
             body: JSON.stringify({ content, lang })
-        });
+        }, 'validate');
     }
 
     /**
@@ -103,7 +128,19 @@ class ApiService {
         return this._fetch('/api/compile', {
             method: 'POST',
             body: JSON.stringify({ content, filename })
-        });
+        }, 'play');
+    }
+
+    /**
+     * Compile a saved story by filename in a single request
+     * @param {string} filename - Story filename in the library
+     * @returns {Promise<Object>} Compilation result with play_url
+     */
+    async playStory(filename) {
+        return this._fetch('/api/play', {
+            method: 'POST',
+            body: JSON.stringify({ filename })
+        }, 'play');
     }
 
     /**
@@ -25,6 +25,11 @@ class Application {
             this.storyManager = new StoryManager(this.apiService, this.i18nService);
             this.uiController = new UIController(this.storyManager, this.i18nService);
 
+            // The story list doesn't need translations, so fetch it while
+            // i18n loads; errors are reported when the library renders.
+            const storiesLoading = this.storyManager.loadStories();
+            storiesLoading.catch(() => {});
+
             // Initialize i18n (load languages and translations)
             await this.i18nService.init();
 
@@ -35,8 +40,8 @@ class Application {
             // Initialize UI
             this.uiController.init();
 
-            // Load initial data
-            await this.uiController.loadStories();
+            // Show the initial library from the request started above
+            await this.uiController.loadStories(storiesLoading);
 
             console.log('✅ Application initialized successfully');
         } catch (error) {
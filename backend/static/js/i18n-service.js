@@ -19,8 +19,11 @@ class I18nService {
      * @returns {Promise<void>}
      */
     async init() {
-        await this.loadAvailableLanguages();
-        await this.loadLanguage(this.currentLanguage);
+        // Independent requests: fetch the language list and translations together
+        await Promise.all([
+            this.loadAvailableLanguages(),
+            this.loadLanguage(this.currentLanguage)
+        ]);
     }
 
     /**
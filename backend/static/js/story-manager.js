@@ -10,9 +10,18 @@ class StoryManager {
     constructor(apiService, i18nService) {
         this.apiService = apiService;
         this.i18n = i18nService;
-        this.stories = [];
+        // Start from the list saved by the previous visit so the library can
+        // paint before /api/stories answers (stale-while-revalidate).
+        this.stories = this._readCachedStories();
         this.selectedStory = null;
         this.currentEditingFilename = null;
+        // Content request started when a story is selected: { filename, promise }.
+        this._prefetch = null;
+        // Pending validate/compile requests keyed by their inputs.
+        this._inflight = new Map();
+        // Recent validation results keyed by language + content (LRU order).
+        this._validateCache = new Map();
+        this._validateCacheSize = 16;
     }
 
     /**
@@ -22,6 +31,7 @@ class StoryManager {
     async loadStories() {
         try {
             this.stories = await this.apiService.getStories();
+            this._writeCachedStories(this.stories);
             return this.stories;
         } catch (error) {
             console.error('Error loading stories:', error);
@@ -29,6 +39,32 @@ class StoryManager {
         }
     }
 
+    /**
+     * Read the story list persisted by a previous load
+     * @private
+     * @returns {Array}
+     */
+    _readCachedStories() {
+        try {
+            const stored = JSON.parse(localStorage.getItem('storyLibrary'));
+            return Array.isArray(stored) ? stored : [];
+        } catch (error) {
+            return [];
+        }
+    }
+
+    /**
+     * Persist the story list for the next visit
+     * @private
+     */
+    _writeCachedStories(stories) {
+        try {
+            localStorage.setItem('storyLibrary', JSON.stringify(stories));
+        } catch (error) {
+            // Storage full or disabled: the cache is only an optimization.
+        }
+    }
+
     /**
      * Get all stories
      * @returns {Array}
@@ -43,6 +79,34 @@ class StoryManager {
      */
     selectStory(story) {
         this.selectedStory = story;
+        this._prefetchContent(story.filename);
+    }
+
+    /**
+     * Start loading a story's text while the child decides what to do, so
+     * Edit opens without waiting on the network.
+     * @private
+     * @param {string} filename - Story filename
+     */
+    _prefetchContent(filename) {
+        if (this._prefetch && this._prefetch.filename === filename) return;
+        const promise = this.apiService.getStoryContent(filename).then(data => data.content);
+        // A failed prefetch is retried by the real load; don't report it twice.
+        promise.catch(() => {});
+        this._prefetch = { filename, promise };
+    }
+
+    /**
+     * Take the prefetched content for a file, if any (single use).
+     * @private
+     * @param {string} filename - Story filename
+     * @returns {Promise<string>|null}
+     */
+    _takePrefetched(filename) {
+        const prefetch = this._prefetch;
+        if (!prefetch || prefetch.filename !== filename) return null;
+        this._prefetch = null;
+        return prefetch.promise;
     }
 
     /**
@@ -67,9 +131,18 @@ class StoryManager {
      */
     async loadStoryForEditing(story) {
         try {
-            const data = await this.apiService.getStoryContent(story.filename);
+            let content;
+            try {
+                content = await this._takePrefetched(story.filename);
+            } catch (error) {
+                content = null;  // Prefetch failed; fetch again below
+            }
+            if (content == null) {
+                const data = await this.apiService.getStoryContent(story.filename);
+                content = data.content;
+            }
             this.currentEditingFilename = story.filename;
-            return data.content;
+            return content;
         } catch (error) {
             console.error('Error loading story for editing:', error);
             throw error;
@@ -107,10 +180,29 @@ ${t('web_new_story_continue')}
      * @returns {Promise<Object>} Validation result
      */
     async validateStory(content) {
-        if (!content.trim()) {
+        if (this._isBlank(content)) {
             throw new Error(this.i18n.t('web_msg_empty'));
         }
-        return this.apiService.validateStory(content, this.i18n.getCurrentLanguage());
+        const lang = this.i18n.getCurrentLanguage();
+        const key = `${lang}:${content}`;
+
+        // Validation is a pure function of the text, so unchanged content
+        // is answered from memory without a round-trip.
+        if (this._validateCache.has(key)) {
+            const cached = this._validateCache.get(key);
+            this._validateCache.delete(key);
+            this._validateCache.set(key, cached);
+            return cached;
+        }
+
+        const result = await this._coalesce(`validate:${key}`, () =>
+            this.apiService.validateStory(content, lang)
+        );
+        this._validateCache.set(key, result);
+        if (this._validateCache.size > this._validateCacheSize) {
+            this._validateCache.delete(this._validateCache.keys().next().value);
+        }
+        return result;
     }
 
     /**
@@ -120,7 +212,7 @@ ${t('web_new_story_continue')}
      * @returns {Promise<Object>} Save result
      */
     async saveStory(content, filename = null) {
-        if (!content.trim()) {
+        if (this._isBlank(content)) {
             throw new Error(this.i18n.t('web_msg_empty'));
         }
 
@@ -131,9 +223,14 @@ ${t('web_new_story_continue')}
 
         const result = await this.apiService.saveStory(content, saveFilename);
         if (result.success) {
+            this._takePrefetched(result.filename);  // Now out of date
             this.currentEditingFilename = result.filename;
-            // Refresh stories list
-            await this.loadStories();
+            // Patch the saved story into the list rather than re-fetching it all
+            if (result.story) {
+                this._upsertStory(result.story);
+            } else {
+                await this.loadStories();
+            }
         }
         return result;
     }
@@ -146,16 +243,44 @@ ${t('web_new_story_continue')}
     async deleteStory(filename) {
         const result = await this.apiService.deleteStory(filename);
         if (result.success) {
+            this._takePrefetched(filename);
             // Clear selection if deleted story was selected
             if (this.selectedStory && this.selectedStory.filename === filename) {
                 this.clearSelection();
             }
-            // Refresh stories list
-            await this.loadStories();
+            // Drop it from the list locally; no need to re-fetch the library
+            this.stories = this.stories.filter(s => s.filename !== filename);
+            this._writeCachedStories(this.stories);
         }
         return result;
     }
 
+    /**
+     * Whether content has nothing but whitespace. Stops at the first
+     * non-space character instead of copying the text like trim() does.
+     * @private
+     * @param {string} content - Story content
+     * @returns {boolean}
+     */
+    _isBlank(content) {
+        return !/\S/.test(content);
+    }
+
+    /**
+     * Insert or replace a single story in the list
+     * @private
+     * @param {Object} story - Library entry returned by the save endpoint
+     */
+    _upsertStory(story) {
+        const index = this.stories.findIndex(s => s.filename === story.filename);
+        if (index >= 0) {
+            this.stories[index] = story;
+        } else {
+            this.stories.push(story);
+        }
+        this._writeCachedStories(this.stories);
+    }
+
     /**
      * Compile story
      * @param {string} content - Story content
@@ -163,12 +288,31 @@ ${t('web_new_story_continue')}
      * @returns {Promise<Object>} Compilation result
      */
     async compileStory(content, filename = null) {
-        if (!content.trim()) {
+        if (this._isBlank(content)) {
             throw new Error(this.i18n.t('web_msg_empty'));
         }
 
         const compileFilename = filename || this.currentEditingFilename || 'preview_story.txt';
-        return this.apiService.compileStory(content, compileFilename);
+        return this._coalesce(`compile:${compileFilename}:${content}`, () =>
+            this.apiService.compileStory(content, compileFilename)
+        );
+    }
+
+    /**
+     * Share one in-flight request between identical calls, so a child
+     * clicking a button repeatedly while it is busy sends a single POST.
+     * @private
+     * @param {string} key - Identifies the request by its inputs
+     * @param {Function} request - Starts the request, returning a Promise
+     * @returns {Promise<Object>}
+     */
+    _coalesce(key, request) {
+        if (this._inflight.has(key)) {
+            return this._inflight.get(key);
+        }
+        const promise = request().finally(() => this._inflight.delete(key));
+        this._inflight.set(key, promise);
+        return promise;
     }
 
     /**
@@ -180,8 +324,9 @@ ${t('web_new_story_continue')}
             throw new Error('No story selected');
         }
 
-        const data = await this.apiService.getStoryContent(this.selectedStory.filename);
-        return this.apiService.compileStory(data.content, this.selectedStory.filename);
+        // The server reads and compiles the file itself: one round-trip.
+        const filename = this.selectedStory.filename;
+        return this._coalesce(`play:${filename}`, () => this.apiService.playStory(filename));
     }
 
     /**
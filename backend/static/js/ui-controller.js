@@ -12,6 +12,14 @@ class UIController {
         this.i18n = i18nService;
         this.currentPage = 'library';
         this.elements = {};
+        // filename -> story for the cards currently rendered in the library.
+        this._storiesByFilename = new Map();
+        // Language + serialized stories of the library currently on screen.
+        this._renderedStoriesKey = null;
+        // message element -> pending auto-hide timer
+        this._messageTimers = new Map();
+        // Resolver of the save dialog's pending filename question.
+        this._saveDialogResolve = null;
         // Markdown features the child has used in the current story (badges).
         this._earnedBadges = new Set();
         // id -> localized label, filled from the Markdown help content.
@@ -26,6 +34,14 @@ class UIController {
             choice: '🔀',
             list: '📋',
         };
+        // Entities for _escapeHtml; quotes included so output is attribute-safe.
+        this._htmlEscapes = {
+            '&': '&amp;',
+            '<': '&lt;',
+            '>': '&gt;',
+            '"': '&quot;',
+            "'": '&#39;',
+        };
     }
 
     /**
@@ -48,6 +64,11 @@ class UIController {
             // Navigation
             bookmarks: document.querySelectorAll('.bookmark'),
             pages: document.querySelectorAll('.page'),
+            // page name -> its animated title
+            pageTitles: new Map(Array.from(
+                document.querySelectorAll('.page .magic-title'),
+                title => [title.closest('.page').id.replace('page-', ''), title]
+            )),
             playerBookmark: document.getElementById('playerBookmark'),
             languageSelector: document.getElementById('languageSelector'),
             
@@ -87,6 +108,14 @@ class UIController {
             tutorialCheat: document.getElementById('tutorialCheat'),
             tutorialCheatHeading: document.getElementById('tutorialCheatHeading'),
 
+            // Save dialog
+            saveOverlay: document.getElementById('saveOverlay'),
+            saveForm: document.getElementById('saveForm'),
+            saveClose: document.getElementById('saveClose'),
+            saveLabel: document.getElementById('saveLabel'),
+            saveFilename: document.getElementById('saveFilename'),
+            saveConfirm: document.getElementById('saveConfirm'),
+
             // Player page
             storyPlayer: document.getElementById('storyPlayer')
         };
@@ -106,6 +135,7 @@ class UIController {
         this.elements.playBtn.addEventListener('click', () => this._handlePlayStory());
         this.elements.editLibraryBtn.addEventListener('click', () => this._handleEditFromLibrary());
         this.elements.newStoryBtn.addEventListener('click', () => this._handleNewStory());
+        this._setupStoryListEvents();
 
         // Editor buttons
         this.elements.validateBtn.addEventListener('click', () => this._handleValidateStory());
@@ -140,8 +170,57 @@ class UIController {
                 if (e.target === this.elements.tutorialOverlay) this._closeTutorial();
             });
         }
+
+        // Save dialog
+        if (this.elements.saveForm) {
+            this.elements.saveForm.addEventListener('submit', (e) => {
+                e.preventDefault();
+                this._closeSaveDialog(this.elements.saveFilename.value.trim() || null);
+            });
+            this.elements.saveClose.addEventListener('click', () => this._closeSaveDialog(null));
+            this.elements.saveOverlay.addEventListener('click', (e) => {
+                if (e.target === this.elements.saveOverlay) this._closeSaveDialog(null);
+            });
+        }
+
         document.addEventListener('keydown', (e) => {
-            if (e.key === 'Escape') this._closeTutorial();
+            if (e.key === 'Escape') {
+                this._closeTutorial();
+                this._closeSaveDialog(null);
+            }
+        });
+    }
+
+    /**
+     * Handle clicks on every story card with one delegated listener on the
+     * persistent list container, instead of three listeners per card.
+     * @private
+     */
+    _setupStoryListEvents() {
+        const list = this.elements.storyList;
+        const storyFor = (e) => {
+            const card = e.target.closest('.story-card');
+            const story = card && this._storiesByFilename.get(card.dataset.filename);
+            return story ? { story, card } : null;
+        };
+
+        // Single click to select, or delete via the card's ✕ button
+        list.addEventListener('click', (e) => {
+            const hit = storyFor(e);
+            if (!hit) return;
+            if (e.target.closest('.story-card-delete')) {
+                this._handleDeleteStory(hit.story.filename, hit.story.title);
+            } else {
+                this._selectStoryCard(hit.story, hit.card);
+            }
+        });
+
+        // Double click to play
+        list.addEventListener('dblclick', (e) => {
+            const hit = storyFor(e);
+            if (!hit || e.target.closest('.story-card-delete')) return;
+            this._selectStoryCard(hit.story, hit.card);
+            this._handlePlayStory();
         });
     }
 
@@ -188,33 +267,58 @@ class UIController {
     }
 
     /**
-     * Load and display stories
+     * Load and display stories.
+     *
+     * Stale-while-revalidate: stories already known (from this session or
+     * the previous visit) are painted immediately, then the list is fetched
+     * and the grid is only rebuilt if something actually changed.
+     * @param {Promise<Array>|null} pending - A story list request already in flight
      */
-    async loadStories() {
+    async loadStories(pending = null) {
         const listEl = this.elements.storyList;
-        
-        // Show loading state
-        listEl.innerHTML = `
-            <div class="loading active">
-                <div class="spinner"></div>
-                <p data-i18n="web_loading_stories">${this.i18n.t('web_loading_stories')}</p>
-            </div>
-        `;
+        const cached = this.storyManager.getStories();
 
-        try {
-            const stories = await this.storyManager.loadStories();
-            listEl.innerHTML = '';
+        if (cached.length > 0) {
+            this._renderStories(cached);
+        } else {
+            // Show loading state
+            this._renderedStoriesKey = null;
+            listEl.innerHTML = `
+                <div class="loading active">
+                    <div class="spinner"></div>
+                    <p data-i18n="web_loading_stories">${this.i18n.t('web_loading_stories')}</p>
+                </div>
+            `;
+        }
 
-            if (stories.length === 0) {
-                this._renderEmptyState(listEl);
-            } else {
-                this._renderStoryGrid(listEl, stories);
-            }
+        try {
+            const stories = await (pending || this.storyManager.loadStories());
+            this._renderStories(stories);
         } catch (error) {
             this.showMessage(this.i18n.t('web_msg_error') + ': ' + error.message, 'error');
         }
     }
 
+    /**
+     * Render the library, skipping the DOM work when the same stories are
+     * already on screen in the same language.
+     * @private
+     */
+    _renderStories(stories) {
+        const key = this.i18n.getCurrentLanguage() + JSON.stringify(stories);
+        if (key === this._renderedStoriesKey) return;
+        this._renderedStoriesKey = key;
+
+        const listEl = this.elements.storyList;
+        listEl.innerHTML = '';
+
+        if (stories.length === 0) {
+            this._renderEmptyState(listEl);
+        } else {
+            this._renderStoryGrid(listEl, stories);
+        }
+    }
+
     /**
      * Render empty state
      * @private
@@ -234,57 +338,35 @@ class UIController {
      * @private
      */
     _renderStoryGrid(container, stories) {
+        this._storiesByFilename = new Map(stories.map(story => [story.filename, story]));
+
         const grid = document.createElement('div');
         grid.className = 'story-grid';
-
-        stories.forEach(story => {
-            const card = this._createStoryCard(story);
-            grid.appendChild(card);
-        });
+        // One markup string, parsed once: the browser lays the grid out a
+        // single time instead of once per appended card.
+        grid.innerHTML = stories.map(story => this._storyCardHtml(story)).join('');
 
         container.appendChild(grid);
     }
 
     /**
-     * Create a story card element
+     * Build the markup for one story card
      * @private
      */
-    _createStoryCard(story) {
-        const card = document.createElement('div');
-        card.className = 'story-card';
-        card.innerHTML = `
-            <button class="story-card-delete" 
-                    title="${this.i18n.t('web_btn_delete')}" 
-                    data-filename="${story.filename}"
-                    aria-label="${this.i18n.t('web_btn_delete')} ${story.title}">✕</button>
-            <div class="story-card-title">${this._escapeHtml(story.title)}</div>
-            <div class="story-card-meta">${this.i18n.t('web_by')} ${this._escapeHtml(story.author)}</div>
-            <div class="story-card-meta">${story.sections || '?'} ${this.i18n.t('web_sections')}</div>
-        `;
-
-        // Single click to select
-        card.addEventListener('click', (e) => {
-            if (!e.target.classList.contains('story-card-delete')) {
-                this._selectStoryCard(story, card);
-            }
-        });
-
-        // Double click to play
-        card.addEventListener('dblclick', (e) => {
-            if (!e.target.classList.contains('story-card-delete')) {
-                this._selectStoryCard(story, card);
-                this._handlePlayStory();
-            }
-        });
-
-        // Delete button
-        const deleteBtn = card.querySelector('.story-card-delete');
-        deleteBtn.addEventListener('click', (e) => {
-            e.stopPropagation();
-            this._handleDeleteStory(story.filename, story.title);
-        });
-
-        return card;
+    _storyCardHtml(story) {
+        const esc = (text) => this._escapeHtml(text);
+        const deleteLabel = esc(this.i18n.t('web_btn_delete'));
+        const selected = this.storyManager.getSelectedStory();
+        const selectedClass = selected && selected.filename === story.filename ? ' selected' : '';
+        return `
+            <div class="story-card${selectedClass}" data-filename="${esc(story.filename)}">
+                <button class="story-card-delete" 
+                        title="${deleteLabel}" 
+                        aria-label="${deleteLabel} ${esc(story.title)}">✕</button>
+                <div class="story-card-title">${esc(story.title)}</div>
+                <div class="story-card-meta">${esc(this.i18n.t('web_by'))} ${esc(story.author)}</div>
+                <div class="story-card-meta">${esc(story.sections || '?')} ${esc(this.i18n.t('web_sections'))}</div>
+            </div>`;
     }
 
     /**
@@ -292,10 +374,9 @@ class UIController {
      * @private
      */
     _selectStoryCard(story, element) {
-        // Deselect all cards
-        document.querySelectorAll('.story-card').forEach(c => 
-            c.classList.remove('selected')
-        );
+        // Deselect the previous card (at most one is selected)
+        const previous = this.elements.storyList.querySelector('.story-card.selected');
+        if (previous) previous.classList.remove('selected');
 
         // Select this card
         element.classList.add('selected');
@@ -331,10 +412,13 @@ class UIController {
     _showMessageInElement(element, text, type) {
         element.textContent = text;
         element.className = `message ${type} active`;
-        
-        setTimeout(() => {
+
+        // One pending hide per element: a new message restarts the clock
+        // instead of being cut short by an earlier message's timer.
+        clearTimeout(this._messageTimers.get(element));
+        this._messageTimers.set(element, setTimeout(() => {
             element.classList.remove('active');
-        }, 5000);
+        }, 5000));
     }
 
     /**
@@ -366,9 +450,7 @@ class UIController {
             const result = await this.storyManager.playSelectedStory();
             
             if (result.success) {
-                this.elements.storyPlayer.src = result.play_url;
-                this.elements.storyPlayer.classList.add('active');
-                this.switchPage('player');
+                this._showPlayer(result.play_url);
             } else {
                 this.showMessage(
                     this.i18n.t('web_msg_errors') + ': ' + 
@@ -377,10 +459,25 @@ class UIController {
                 );
             }
         } catch (error) {
+            if (error.name === 'AbortError') return;  // Superseded by a newer click
             this.showMessage(this.i18n.t('web_msg_error') + ': ' + error.message, 'error');
         }
     }
 
+    /**
+     * Switch to the player page, then point the iframe at the story.
+     * Showing the page first lets the lazy iframe start loading only once it
+     * is visible, in the same frame the page appears.
+     * @param {string} playUrl - URL of the compiled story
+     * @private
+     */
+    _showPlayer(playUrl) {
+        const player = this.elements.storyPlayer;
+        this.switchPage('player');
+        player.classList.add('active');
+        player.src = playUrl;
+    }
+
     async _handleEditFromLibrary() {
         const selected = this.storyManager.getSelectedStory();
         if (!selected) return;
@@ -435,6 +532,7 @@ class UIController {
                 );
             }
         } catch (error) {
+            if (error.name === 'AbortError') return;  // Superseded by a newer click
             this.showEditorMessage(this.i18n.t('web_msg_error') + ': ' + error.message, 'error');
         }
     }
@@ -442,8 +540,7 @@ class UIController {
     async _handleSaveStory() {
         const content = this.elements.storyEditor.value;
         
-        const filename = prompt(
-            this.i18n.t('web_prompt_save'), 
+        const filename = await this._askSaveFilename(
             this.storyManager.getCurrentEditingFilename() || 'my_story.txt'
         );
         
@@ -478,9 +575,7 @@ class UIController {
             const result = await this.storyManager.compileStory(content);
             
             if (result.success) {
-                this.elements.storyPlayer.src = result.play_url;
-                this.elements.storyPlayer.classList.add('active');
-                this.switchPage('player');
+                this._showPlayer(result.play_url);
             } else {
                 this.showEditorMessage(
                     this.i18n.t('web_msg_compilation_errors') + ': ' + 
@@ -489,6 +584,7 @@ class UIController {
                 );
             }
         } catch (error) {
+            if (error.name === 'AbortError') return;  // Superseded by a newer click
             this.showEditorMessage(this.i18n.t('web_msg_error') + ': ' + error.message, 'error');
         }
     }
@@ -507,7 +603,7 @@ class UIController {
                 );
                 this.elements.playBtn.disabled = true;
                 this.elements.editLibraryBtn.disabled = true;
-                await this.loadStories();
+                this._renderStories(this.storyManager.getStories());
             } else {
                 this.showMessage(
                     this.i18n.t('web_msg_error') + ': ' + 
@@ -525,7 +621,7 @@ class UIController {
      * @private
      */
     _animatePageTitle(pageName) {
-        const title = document.querySelector(`#page-${pageName} .magic-title`);
+        const title = this.elements.pageTitles.get(pageName);
         if (!title) return;
 
         title.classList.remove('is-animating');
@@ -876,13 +972,57 @@ class UIController {
     }
 
     /**
-     * Utility: Escape HTML to prevent XSS
+     * Ask for a filename in the save dialog. Unlike prompt() this does not
+     * block the page, so timers and pending requests keep running.
+     * @param {string} defaultName - Prefilled filename
+     * @returns {Promise<string|null>} The filename, or null when cancelled
+     * @private
+     */
+    _askSaveFilename(defaultName) {
+        const overlay = this.elements.saveOverlay;
+        if (!overlay) {
+            return Promise.resolve(prompt(this.i18n.t('web_prompt_save'), defaultName));
+        }
+
+        // A second Save click while open replaces the pending question
+        this._closeSaveDialog(null);
+
+        this.elements.saveLabel.textContent = this.i18n.t('web_prompt_save');
+        this.elements.saveConfirm.textContent = this.i18n.t('web_btn_save');
+
+        const input = this.elements.saveFilename;
+        input.value = defaultName;
+        overlay.hidden = false;
+        input.focus();
+        input.select();
+
+        return new Promise(resolve => {
+            this._saveDialogResolve = resolve;
+        });
+    }
+
+    /**
+     * Close the save dialog and settle the pending question.
+     * @param {string|null} filename - The chosen name, or null to cancel
+     * @private
+     */
+    _closeSaveDialog(filename) {
+        const resolve = this._saveDialogResolve;
+        if (!resolve) return;
+
+        this._saveDialogResolve = null;
+        this.elements.saveOverlay.hidden = true;
+        this.elements.saveBtn.focus();
+        resolve(filename);
+    }
+
+    /**
+     * Utility: Escape HTML to prevent XSS. Safe in text and in quoted
+     * attributes, and needs no throwaway DOM node per call.
      * @private
      */
     _escapeHtml(text) {
-        const div = document.createElement('div');
-        div.textContent = text;
-        return div.innerHTML;
+        return String(text ?? '').replace(/[&<>"']/g, ch => this._htmlEscapes[ch]);
     }
 }
 
@@ -1,5 +1,11 @@
 """Utility functions for the backend."""
 
 from .file_utils import sanitize_filename, is_safe_path
+from .compression import accepts_gzip, compress_response, compress_static_response
+from .json_provider import OrjsonProvider, install_json_provider
 
-__all__ = ['sanitize_filename', 'is_safe_path']
+__all__ = [
+    'sanitize_filename', 'is_safe_path', 'accepts_gzip', 'compress_response',
+    'compress_static_response',
+    'OrjsonProvider', 'install_json_provider',
+]
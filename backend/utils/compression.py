@@ -0,0 +1,123 @@
+"""Gzip content-encoding helpers for dynamic responses."""
+
+import gzip
+import os
+
+from flask import Response, request
+
+# Bodies smaller than this are not worth the gzip header and CPU
+MIN_COMPRESS_SIZE = 1024
+
+# Level 1 is nearly free on CPU but still shrinks JSON several times over
+DEFAULT_COMPRESS_LEVEL = 1
+
+COMPRESSIBLE_MIMETYPES = {'application/json', 'text/html'}
+
+# Text assets under /static; images and fonts are already compressed
+STATIC_COMPRESSIBLE_MIMETYPES = {
+    'text/css', 'text/javascript', 'application/javascript', 'image/svg+xml',
+}
+
+# Static files are compressed once at the highest level and reused until they
+# change: path -> ((mtime_ns, size), gzip body)
+_static_gzip_cache: dict[str, tuple[tuple[int, int], bytes]] = {}
+
+
+def accepts_gzip() -> bool:
+    """Return True if the current request advertises gzip support."""
+    return request.accept_encodings['gzip'] > 0
+
+
+def compress_response(response: Response, level: int = DEFAULT_COMPRESS_LEVEL) -> Response:
+    """
+    Gzip a buffered response in place when the client accepts it.
+    
+    Streamed/file responses, non-200 responses, already-encoded bodies and
+    small payloads are left untouched. A strong ETag is downgraded to a weak
+    one, since the encoded bytes differ from what the ETag was computed on.
+    
+    Args:
+        response: Response about to be sent
+        level: gzip compression level (1-9)
+        
+    Returns:
+        The same response object
+    """
+    if response.mimetype not in COMPRESSIBLE_MIMETYPES:
+        return response
+    
+    response.vary.add('Accept-Encoding')
+    
+    if (
+        response.status_code != 200
+        or response.direct_passthrough
+        or response.is_streamed
+        or 'Content-Encoding' in response.headers
+        or not accepts_gzip()
+    ):
+        return response
+    
+    body = response.get_data()
+    if len(body) < MIN_COMPRESS_SIZE:
+        return response
+    
+    response.set_data(gzip.compress(body, compresslevel=level))
+    response.headers['Content-Encoding'] = 'gzip'
+    
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    
+    return response
+
+
+def compress_static_response(response: Response, path: str | os.PathLike) -> Response:
+    """
+    Swap a static file response for its gzip variant when the client accepts it.
+    
+    The compressed body is cached per file version, so each asset is gzipped
+    once rather than on every request. Ranges, 304s and other encodings are
+    left untouched.
+    
+    Args:
+        response: send_file response for path
+        path: The static file on disk
+        
+    Returns:
+        The same response object
+    """
+    if response.mimetype not in STATIC_COMPRESSIBLE_MIMETYPES:
+        return response
+    
+    response.vary.add('Accept-Encoding')
+    
+    if (
+        response.status_code != 200
+        or 'Content-Encoding' in response.headers
+        or not accepts_gzip()
+    ):
+        return response
+    
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return response
+    key = (stat.st_mtime_ns, stat.st_size)
+    cached = _static_gzip_cache.get(os.fspath(path))
+    if cached and cached[0] == key:
+        body = cached[1]
+    else:
+        with open(path, 'rb') as f:
+            body = gzip.compress(f.read(), compresslevel=9)
+        _static_gzip_cache[os.fspath(path)] = (key, body)
+    
+    response.close()  # Release the file send_file opened
+    response.direct_passthrough = False
+    response.set_data(body)
+    response.headers['Content-Encoding'] = 'gzip'
+    
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    
+    return response
@@ -1,8 +1,32 @@
 """File utility functions for path validation and filename sanitization."""
 
-import re
+import os
+import string
+from functools import lru_cache
 from pathlib import Path
 
+# Characters allowed in a sanitized filename
+_SAFE_FILENAME_CHARS = string.ascii_letters + string.digits + '_.-'
+
+
+class _ReplaceUnsafeTable(dict):
+    """str.translate table: safe characters map to themselves, anything else to '_'."""
+
+    def __init__(self):
+        super().__init__((ord(c), ord(c)) for c in _SAFE_FILENAME_CHARS)
+
+    def __missing__(self, codepoint: int) -> int:
+        return ord('_')
+
+
+_FILENAME_TABLE = _ReplaceUnsafeTable()
+
+
+@lru_cache(maxsize=32)
+def _resolved_base(base_dir: Path) -> str:
+    """Resolve a base directory once; the few bases used are fixed at import."""
+    return str(base_dir.resolve())
+
 
 def is_safe_path(base_dir: Path, requested_path: str) -> tuple[bool, Path]:
     """
@@ -26,8 +50,8 @@ def is_safe_path(base_dir: Path, requested_path: str) -> tuple[bool, Path]:
         (False, Path())
     """
     try:
-        # Check for obvious traversal attempts
-        if '..' in requested_path or requested_path.startswith('/'):
+        # Check for obvious traversal attempts (and NUL bytes) before any I/O
+        if '..' in requested_path or requested_path.startswith('/') or '\x00' in requested_path:
             return False, Path()
         
         # Check for path separators with traversal
@@ -39,7 +63,10 @@ def is_safe_path(base_dir: Path, requested_path: str) -> tuple[bool, Path]:
         # Resolve full path and verify it's within base_dir
         full_path = (base_dir / requested_path).resolve()
         
-        if not str(full_path).startswith(str(base_dir.resolve())):
+        # Compare whole path components: a plain prefix check would accept
+        # a sibling such as /app/stories_old for base /app/stories
+        base = _resolved_base(base_dir)
+        if os.path.commonpath([base, str(full_path)]) != base:
             return False, Path()
         
         return True, full_path
@@ -73,11 +100,8 @@ def sanitize_filename(filename: str, extension: str = '.txt', default: str = 'ne
     # Remove path traversal attempts
     filename = filename.replace('../', '').replace('..\\', '')
     
-    # Remove directory separators
-    filename = filename.replace('/', '_').replace('\\', '_')
-    
-    # Allow only alphanumeric, dash, underscore, dot
-    filename = re.sub(r'[^a-zA-Z0-9_.-]', '_', filename)
+    # Allow only alphanumeric, dash, underscore, dot (separators become '_')
+    filename = filename.translate(_FILENAME_TABLE)
     
     # Remove leading/trailing dots and underscores
     filename = filename.strip('._')
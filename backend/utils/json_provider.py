@@ -0,0 +1,60 @@
+"""orjson-backed JSON provider for Flask.
+
+orjson is listed in requirements.txt, but the app doesn't require it: where
+it can't be installed the app keeps Flask's stdlib-based provider and
+behaves exactly the same.
+"""
+
+from typing import Any
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Serialize responses and parse request bodies with orjson.
+
+    orjson writes bytes directly and parses bytes without a separate UTF-8
+    decode, which saves a copy of every body. Non-ASCII text is emitted as
+    UTF-8 rather than \\u escapes; the response charset is UTF-8 either way.
+    """
+
+    def _options(self, sort_keys: bool, indent: bool) -> int:
+        option = orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        """Serialize to a str; unusual json.dumps arguments use the stdlib."""
+        if set(kwargs) - {'sort_keys', 'indent', 'separators', 'default'}:
+            return super().dumps(obj, **kwargs)
+        option = self._options(kwargs.get('sort_keys', self.sort_keys), bool(kwargs.get('indent')))
+        return orjson.dumps(obj, default=kwargs.get('default', self.default), option=option).decode('utf-8')
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        """Parse JSON from str or bytes."""
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        """Build a JSON response straight from orjson's bytes."""
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        option = self._options(self.sort_keys, indent) | orjson.OPT_APPEND_NEWLINE
+        body = orjson.dumps(obj, default=self.default, option=option)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+def install_json_provider(app) -> None:
+    """Use OrjsonProvider for ``app`` when orjson is available."""
+    if orjson is not None:
+        app.json = OrjsonProvider(app)
@@ -2,6 +2,8 @@
 Tests for API endpoints - health, stories, compilation, i18n.
 """
 
+import gzip
+import os
 import pytest
 from pathlib import Path
 import sys
@@ -9,6 +11,8 @@ import sys
 # Add backend to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from flask import url_for
+
 from backend.main import app
 
 @pytest.fixture
@@ -124,6 +128,17 @@ class TestStoriesEndpoint:
             assert "filename" in data
             assert data["filename"] == filename
     
+    def test_get_story_content_revalidates_with_etag(self, client):
+        """An unchanged story should answer If-None-Match with 304."""
+        stories = client.get("/api/stories").get_json()
+        filename = stories[0]["filename"]
+        first = client.get(f"/api/story/{filename}")
+        assert first.headers.get("ETag")
+        
+        second = client.get(f"/api/story/{filename}", headers={"If-None-Match": first.headers["ETag"]})
+        assert second.status_code == 304
+        assert second.data == b""
+    
     def test_get_story_content_nonexistent_file_returns_404(self, client):
         """Should return 404 for non-existent file."""
         response = client.get("/api/story/nonexistent_file.txt")
@@ -232,3 +247,104 @@ class TestPageEndpoint:
         assert response.status_code == 200
         assert "text/html" in response.content_type
         assert b"Pick-a-Page" in response.data
+    
+    def test_index_page_has_etag(self, client):
+        """Index page should carry an ETag so browsers can revalidate."""
+        response = client.get("/")
+        assert response.headers.get("ETag")
+    
+    def test_index_page_not_modified(self, client):
+        """A matching If-None-Match should short-circuit with 304."""
+        etag = client.get("/").headers["ETag"]
+        response = client.get("/", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.data == b""
+
+class TestCompression:
+    """Test gzip content-encoding of HTML and JSON responses."""
+    
+    def test_index_page_gzipped_when_accepted(self, client):
+        """Index page should be gzipped for clients that accept it."""
+        response = client.get("/", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert b"Pick-a-Page" in gzip.decompress(response.data)
+    
+    def test_index_page_plain_without_accept_encoding(self, client):
+        """Index page should be sent uncompressed by default."""
+        response = client.get("/")
+        assert "Content-Encoding" not in response.headers
+        assert "Accept-Encoding" in response.headers["Vary"]
+    
+    def test_gzipped_index_still_revalidates(self, client):
+        """The gzip variant's ETag should still produce a 304."""
+        headers = {"Accept-Encoding": "gzip"}
+        etag = client.get("/", headers=headers).headers["ETag"]
+        response = client.get("/", headers={**headers, "If-None-Match": etag})
+        assert response.status_code == 304
+    
+    def test_large_json_gzipped(self, client):
+        """JSON responses above the size threshold should be gzipped."""
+        plain = client.get("/api/translations/en")
+        response = client.get("/api/translations/en", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert gzip.decompress(response.data) == plain.data
+    
+    def test_small_json_not_gzipped(self, client):
+        """Tiny JSON bodies are not worth compressing."""
+        response = client.get("/health", headers={"Accept-Encoding": "gzip"})
+        assert "Content-Encoding" not in response.headers
+        assert response.get_json()["status"] == "healthy"
+
+class TestStaticCaching:
+    """Test far-future caching of versioned static assets."""
+    
+    def test_index_links_versioned_assets(self, client):
+        """Static asset URLs in the page should carry a version query."""
+        html = client.get("/").data.decode("utf-8")
+        assert "/static/js/app.js?v=" in html
+    
+    def test_version_changes_within_one_second(self, tmp_path, monkeypatch):
+        """Two edits in the same second should still give different URLs."""
+        asset = tmp_path / "app.js"
+        asset.write_text("first", encoding="utf-8")
+        monkeypatch.setattr(app, "static_folder", str(tmp_path))
+        second = 1_700_000_000 * 10**9
+        with app.test_request_context():
+            os.utime(asset, ns=(second, second))
+            first_url = url_for("static", filename="app.js")
+            os.utime(asset, ns=(second + 1000, second + 1000))
+            assert url_for("static", filename="app.js") != first_url
+    
+    def test_versioned_asset_is_immutable(self, client):
+        """A versioned static URL should be cacheable forever."""
+        response = client.get("/static/js/app.js?v=1")
+        assert response.status_code == 200
+        assert response.cache_control.immutable
+        assert response.cache_control.max_age == 365 * 24 * 60 * 60
+        response.close()
+    
+    def test_script_gzipped_when_accepted(self, client):
+        """JS and CSS should be served gzipped to clients that accept it."""
+        plain = client.get("/static/js/app.js?v=1")
+        response = client.get("/static/js/app.js?v=1", headers={"Accept-Encoding": "gzip"})
+        assert response.status_code == 200
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert "Accept-Encoding" in response.headers["Vary"]
+        assert gzip.decompress(response.data) == plain.data
+        assert response.cache_control.immutable
+        plain.close()
+    
+    def test_gzipped_asset_still_revalidates(self, client):
+        """The gzip variant's ETag should still produce a 304."""
+        headers = {"Accept-Encoding": "gzip"}
+        etag = client.get("/static/css/editor.css", headers=headers).headers["ETag"]
+        response = client.get("/static/css/editor.css", headers={**headers, "If-None-Match": etag})
+        assert response.status_code == 304
+        response.close()
+    
+    def test_unversioned_asset_revalidates(self, client):
+        """A bare static URL should not be cached without revalidation."""
+        response = client.get("/static/js/app.js")
+        assert response.status_code == 200
+        assert not response.cache_control.immutable
+        response.close()
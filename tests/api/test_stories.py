@@ -8,11 +8,14 @@ from pathlib import Path
 import sys
 import tempfile
 import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 # Add backend to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from backend.main import app
+from backend.api.routers import compile_router, stories
 
 # Stories directory path
 STORIES_DIR = Path(__file__).parent.parent.parent / "stories"
@@ -31,6 +34,10 @@ def cleanup_test_stories():
         "evil.txt",
         "default_story.txt",
         "dutch_story.txt",
+        "list_cache_story.txt",
+        "stream_save_story.txt",
+        "binary_story.txt",
+        "csrf_probe.txt",
     ]
     
     def cleanup():
@@ -49,6 +56,46 @@ def cleanup_test_stories():
     # Cleanup after tests
     cleanup()
 
+@pytest.fixture(autouse=True)
+def output_dir(tmp_path, monkeypatch):
+    """Compile into a temporary directory instead of the real output/."""
+    output_dir = tmp_path / "output"
+    monkeypatch.setattr(compile_router, "OUTPUT_DIR", output_dir)
+    return output_dir
+
+@pytest.fixture(autouse=True)
+def fresh_compile_state(monkeypatch):
+    """Start each test with empty compile caches and an idle precompile worker.
+    
+    Saves in earlier tests leave results cached and may still hold the one
+    precompile slot, which would make precompile_story skip.
+    """
+    compile_router._build_story_html.cache_clear()
+    compile_router._validation_summary.cache_clear()
+    pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='precompile')
+    monkeypatch.setattr(compile_router, "_precompile_pool", pool)
+    monkeypatch.setattr(compile_router, "_precompile_slots", threading.BoundedSemaphore(1))
+    yield
+    pool.shutdown(wait=True)
+
+@pytest.fixture
+def forbid_reparse(monkeypatch):
+    """Call to make any further story parse fail the test."""
+    def forbid():
+        def fail_parse(content):
+            raise AssertionError("story was parsed again")
+        monkeypatch.setattr(compile_router._compiler, "parse", fail_parse)
+    return forbid
+
+@pytest.fixture
+def fill_compile_pool(monkeypatch):
+    """Call to leave no free slot for request compiles."""
+    def fill():
+        slots = threading.BoundedSemaphore(1)
+        slots.acquire()
+        monkeypatch.setattr(compile_router, "_compile_slots", slots)
+    return fill
+
 @pytest.fixture
 def client():
     """Create test client."""
@@ -90,6 +137,80 @@ This is a test.
         assert data["success"] is True
         assert "filename" in data
     
+    def test_save_story_returns_library_entry(self, client):
+        """Save should return the story's library entry for client-side patching."""
+        story_data = {
+            "content": """---
+title: Entry Story
+author: Test Author
+---
+
+[[start]]
+One section.
+""",
+            "filename": "test_save_story.txt"
+        }
+        response = client.post("/api/save", json=story_data)
+        story = response.get_json()["story"]
+        assert story == {
+            "filename": "test_save_story.txt",
+            "title": "Entry Story",
+            "author": "Test Author",
+            "sections": 1
+        }
+    
+    def test_save_raw_body(self, client):
+        """An octet-stream body should be streamed to the named file."""
+        content = "---\ntitle: Streamed\n---\n\n[[start]]\nÉcrit en morceaux.\n"
+        response = client.post(
+            "/api/save?filename=stream_save_story.txt",
+            data=content.encode("utf-8"),
+            content_type="application/octet-stream"
+        )
+        assert response.status_code == 200
+        assert response.get_json()["story"]["title"] == "Streamed"
+        assert (STORIES_DIR / "stream_save_story.txt").read_text(encoding="utf-8") == content
+    
+    def test_save_raw_body_rejects_invalid_utf8(self, client):
+        """Invalid UTF-8 should be rejected without touching the saved story."""
+        client.post(
+            "/api/save?filename=stream_save_story.txt",
+            data=b"---\ntitle: Kept\n---\n\n[[start]]\nKept.\n",
+            content_type="application/octet-stream"
+        )
+        response = client.post(
+            "/api/save?filename=stream_save_story.txt",
+            data=b"\xff\xfe broken",
+            content_type="application/octet-stream"
+        )
+        assert response.status_code == 400
+        assert "Kept" in (STORIES_DIR / "stream_save_story.txt").read_text(encoding="utf-8")
+        assert not list(STORIES_DIR.glob(".*.part"))
+    
+    def test_raw_save_gets_normal_permissions(self, client):
+        """A streamed save should get the same file mode as a JSON save."""
+        content = "---\ntitle: Mode\n---\n\n[[start]]\nSame mode.\n"
+        client.post("/api/save", json={"content": content, "filename": "test_save_story.txt"})
+        client.post(
+            "/api/save?filename=stream_save_story.txt",
+            data=content.encode("utf-8"),
+            content_type="application/octet-stream"
+        )
+        json_mode = (STORIES_DIR / "test_save_story.txt").stat().st_mode
+        raw_mode = (STORIES_DIR / "stream_save_story.txt").stat().st_mode
+        assert raw_mode == json_mode
+
+    def test_cross_site_plain_text_save_refused(self, client):
+        """A text/plain POST, which needs no CORS preflight, must not save."""
+        response = client.post(
+            "/api/save?filename=csrf_probe.txt",
+            data=b"---\ntitle: Pwned\n---\n\n[[start]]\nHi.\n",
+            content_type="text/plain",
+            headers={"Origin": "http://evil.example"}
+        )
+        assert response.status_code == 415
+        assert not (STORIES_DIR / "csrf_probe.txt").exists()
+    
     def test_save_story_sanitizes_filename(self, client):
         """Save should sanitize dangerous filenames."""
         story_data = {
@@ -190,6 +311,75 @@ This will be deleted.
         response = client.post("/api/delete", json={})
         assert response.status_code in [400, 422]
 
+class TestStoryListCache:
+    """Test that the story list picks up edits despite caching."""
+    
+    def _titles(self, client):
+        return {s["filename"]: s["title"] for s in client.get("/api/stories").get_json()}
+    
+    def test_list_reflects_edited_story(self, client):
+        """Re-saving a story should change its listed title."""
+        template = """---
+title: {title}
+author: Test
+---
+
+[[start]]
+Cached listing.
+"""
+        client.post("/api/save", json={
+            "content": template.format(title="First"),
+            "filename": "list_cache_story.txt"
+        })
+        assert self._titles(client)["list_cache_story.txt"] == "First"
+        
+        client.post("/api/save", json={
+            "content": template.format(title="Second Title"),
+            "filename": "list_cache_story.txt"
+        })
+        assert self._titles(client)["list_cache_story.txt"] == "Second Title"
+    
+    def test_list_drops_deleted_story(self, client):
+        """Deleted stories should disappear from the listing."""
+        client.post("/api/save", json={
+            "content": "---\ntitle: Gone\n---\n\n[[start]]\nBye.\n",
+            "filename": "list_cache_story.txt"
+        })
+        assert "list_cache_story.txt" in self._titles(client)
+        
+        client.post("/api/delete", json={"filename": "list_cache_story.txt"})
+        assert "list_cache_story.txt" not in self._titles(client)
+
+    def test_list_forgets_story_removed_from_disk(self, client):
+        """A story deleted outside the API should leave the cache too."""
+        client.post("/api/save", json={
+            "content": "---\ntitle: Vanishing\n---\n\n[[start]]\nPoof.\n",
+            "filename": "list_cache_story.txt"
+        })
+        assert "list_cache_story.txt" in self._titles(client)
+        assert "list_cache_story.txt" in stories._story_cache
+
+        (STORIES_DIR / "list_cache_story.txt").unlink()
+        assert "list_cache_story.txt" not in self._titles(client)
+        assert "list_cache_story.txt" not in stories._story_cache
+
+    def test_unchanged_list_revalidates_with_304(self, client):
+        """An unchanged library should answer If-None-Match with 304."""
+        first = client.get("/api/stories")
+        etag = first.headers["ETag"]
+        
+        second = client.get("/api/stories", headers={"If-None-Match": etag})
+        assert second.status_code == 304
+        assert second.data == b""
+        
+        client.post("/api/save", json={
+            "content": "---\ntitle: New Entry\n---\n\n[[start]]\nHi.\n",
+            "filename": "list_cache_story.txt"
+        })
+        third = client.get("/api/stories", headers={"If-None-Match": etag})
+        assert third.status_code == 200
+        assert third.headers["ETag"] != etag
+
 class TestCompileStoryEndpoint:
     """Test story compilation functionality."""
     
@@ -295,6 +485,119 @@ No metadata here!
         else:
             assert response.status_code in [400, 500]
 
+    def test_recompiling_same_content_reuses_result(self, client, forbid_reparse):
+        """Compiling unchanged content again should not re-parse it."""
+        story_data = {
+            "content": """---
+title: Recompile Test
+---
+
+[[start]]
+Same story twice.
+""",
+            "filename": "compile_test.txt"
+        }
+        first = client.post("/api/compile", json=story_data).get_json()
+        
+        forbid_reparse()
+        
+        second = client.post("/api/compile", json=story_data).get_json()
+        assert second == first
+        assert second["success"] is True
+
+    def test_revalidating_same_content_reuses_result(self, client, forbid_reparse):
+        """Validating unchanged content again should not re-parse it."""
+        story_data = {"content": "---\ntitle: Revalidate\n---\n\n[[start]]\nTwice."}
+        first = client.post("/api/validate", json=story_data).get_json()
+        
+        forbid_reparse()
+        
+        second = client.post("/api/validate", json=story_data).get_json()
+        assert second == first
+        assert second["valid"] is True
+    
+    def test_recompiling_same_content_keeps_output_file(self, client, output_dir):
+        """An unchanged compile should not rewrite the output file."""
+        story_data = {
+            "content": "---\ntitle: Keep Output\n---\n\n[[start]]\nUnchanged.",
+            "filename": "keep_output.txt"
+        }
+        client.post("/api/compile", json=story_data)
+        html_path = output_dir / "keep_output.html"
+        first_mtime = html_path.stat().st_mtime_ns
+        
+        client.post("/api/compile", json=story_data)
+        assert html_path.stat().st_mtime_ns == first_mtime
+        
+        # A file changed behind our back is written again
+        html_path.write_text("tampered", encoding="utf-8")
+        client.post("/api/compile", json=story_data)
+        assert "Keep Output" in html_path.read_text(encoding="utf-8")
+    
+    def test_compile_cache_bounded_by_size(self):
+        """Results past the size cap are evicted; oversized ones aren't kept."""
+        calls = []
+
+        @compile_router._result_cache(maxsize=8, max_chars=10, key=compile_router._content_key)
+        def render(content):
+            calls.append(content)
+            return content.upper()
+
+        render("abcd")
+        render("abcd")
+        assert calls == ["abcd"]
+
+        render("x" * 11)
+        assert render.lookup("x" * 11) is compile_router._MISSING
+
+        render("efghij")
+        render("klm")
+        assert render.lookup("abcd") is compile_router._MISSING
+        assert render.lookup("klm") == "KLM"
+
+    def test_compile_cache_key_is_a_digest(self):
+        """The cache key should not hold the story text itself."""
+        key = compile_router._content_key("x" * 100_000, "en")
+        assert key[1:] == ("en",)
+        assert len(key[0]) == 16
+
+    def test_identical_compiles_share_one_job(self):
+        """A second identical job should join the running one, not start again."""
+        release = threading.Event()
+        calls = []
+        
+        def slow_job(value):
+            calls.append(value)
+            release.wait(5)
+            return value
+        
+        first = compile_router._submit_compile_job(slow_job, "same")
+        second = compile_router._submit_compile_job(slow_job, "same")
+        assert second is first
+        
+        release.set()
+        assert first.result(timeout=5) == "same"
+        assert calls == ["same"]
+    
+    def test_compile_rejected_when_pool_is_full(self, client, fill_compile_pool):
+        """Compile and validate should answer 503 when no compile slot is free."""
+        fill_compile_pool()
+        
+        story_data = {"content": "---\ntitle: Busy\n---\n\n[[start]]\nHi.", "filename": "busy.txt"}
+        assert client.post("/api/compile", json=story_data).status_code == 503
+        assert client.post("/api/validate", json=story_data).status_code == 503
+
+    def test_cached_results_served_when_pool_is_full(self, client, fill_compile_pool):
+        """A repeat compile or validate should not need a free compile slot."""
+        story_data = {"content": "---\ntitle: Cached\n---\n\n[[start]]\nHi.", "filename": "compile_test.txt"}
+        first_compile = client.post("/api/compile", json=story_data).get_json()
+        first_validate = client.post("/api/validate", json=story_data).get_json()
+
+        fill_compile_pool()
+
+        assert client.post("/api/compile", json=story_data).get_json() == first_compile
+        assert client.post("/api/validate", json=story_data).get_json() == first_validate
+
 class TestPlayStoryEndpoint:
     """Test compiled story playback."""
     
@@ -329,11 +632,133 @@ Test story for playback.
             output_file = Path("output") / f"{story_name}.html"
             assert output_file.exists() or True  # File may exist in output/
     
+    def test_play_supports_conditional_get(self, client):
+        """Replaying an unchanged story should revalidate with 304."""
+        story_data = {
+            "content": """---
+title: Conditional Test
+---
+
+[[start]]
+Cached playback.
+""",
+            "filename": "play_test_story.txt"
+        }
+        play_url = client.post("/api/compile", json=story_data).get_json()["play_url"]
+        
+        first = client.get(play_url)
+        assert first.status_code == 200
+        assert first.headers.get("ETag")
+        assert first.headers.get("Last-Modified")
+        assert first.cache_control.no_cache
+        
+        second = client.get(play_url, headers={"If-None-Match": first.headers["ETag"]})
+        assert second.status_code == 304
+    
     def test_play_nonexistent_story_returns_404(self, client):
         """Play endpoint should return 404 for non-existent story."""
         response = client.get("/play/nonexistent_story")
         assert response.status_code == 404
 
+class TestPlaySavedStoryEndpoint:
+    """Test compiling a saved story by filename in one request."""
+    
+    def test_play_saved_story_returns_play_url(self, client):
+        """Playing a saved story should compile it and return a working URL."""
+        client.post("/api/save", json={
+            "content": "---\ntitle: Saved Play\n---\n\n[[start]]\nReady.\n",
+            "filename": "test_save_story.txt"
+        })
+        response = client.post("/api/play", json={"filename": "test_save_story.txt"})
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data["success"] is True
+        assert client.get(data["play_url"]).status_code == 200
+    
+    def test_play_saved_story_reports_validation_errors(self, client):
+        """An invalid saved story should come back with its errors."""
+        client.post("/api/save", json={
+            "content": "---\ntitle: Broken\n---\n\n[[start]]\n[[Nowhere]]\n",
+            "filename": "test_save_story.txt"
+        })
+        data = client.post("/api/play", json={"filename": "test_save_story.txt"}).get_json()
+        assert data["success"] is False
+        assert data["errors"]
+    
+    def test_play_missing_story_returns_404(self, client):
+        """Playing an unknown file should return 404."""
+        response = client.post("/api/play", json={"filename": "does_not_exist.txt"})
+        assert response.status_code == 404
+    
+    def test_play_rejects_path_traversal(self, client):
+        """Playing should reject paths outside the stories directory."""
+        response = client.post("/api/play", json={"filename": "../../etc/passwd"})
+        assert response.status_code == 403
+    
+    def test_play_requires_filename(self, client):
+        """Playing should require a filename."""
+        response = client.post("/api/play", json={})
+        assert response.status_code == 400
+
+    def test_play_rejects_non_story_files(self, client):
+        """Only .txt stories can be played; other files get 400, not 500."""
+        response = client.post("/api/play", json={"filename": "images/dragon-scale.png"})
+        assert response.status_code == 400
+    
+    def test_play_rejects_non_utf8_story(self, client):
+        """A story that isn't UTF-8 should give a clean 400."""
+        (STORIES_DIR / "binary_story.txt").write_bytes(b"\xff\xfe\x00bad")
+        response = client.post("/api/play", json={"filename": "binary_story.txt"})
+        assert response.status_code == 400
+
+    @pytest.mark.parametrize("newline", ["\n", "\r\n"])
+    def test_saved_story_is_compiled_ahead_of_play(self, client, monkeypatch, forbid_reparse, newline):
+        """Playing a just-saved story should reuse the background compile."""
+        futures = []
+        monkeypatch.setattr(
+            stories, "precompile_story",
+            lambda content: futures.append(compile_router.precompile_story(content))
+        )
+        client.post("/api/save", json={
+            "content": "---\ntitle: Ahead\n---\n\n[[start]]\nReady to play.\n".replace("\n", newline),
+            "filename": "test_save_story.txt"
+        })
+        futures[0].result(timeout=5)
+        
+        forbid_reparse()
+        
+        data = client.post("/api/play", json={"filename": "test_save_story.txt"}).get_json()
+        assert data["success"] is True
+
+    def test_raw_save_reads_story_back_once(self, client, monkeypatch):
+        """A streamed save should read the file once for summary and precompile."""
+        reads = []
+        real_open = open
+
+        def counting_open(path, mode='r', *args, **kwargs):
+            if 'r' in mode and str(path).endswith("stream_save_story.txt"):
+                reads.append(path)
+            return real_open(path, mode, *args, **kwargs)
+
+        monkeypatch.setattr(stories, "open", counting_open, raising=False)
+        response = client.post(
+            "/api/save?filename=stream_save_story.txt",
+            data=b"---\ntitle: Once\n---\n\n[[start]]\nRead once.\n",
+            content_type="application/octet-stream"
+        )
+        assert response.get_json()["story"]["title"] == "Once"
+        assert len(reads) == 1
+
+    def test_precompile_leaves_request_slots_free(self, fill_compile_pool):
+        """Background compiles run on their own worker, even with the pool full."""
+        fill_compile_pool()
+        
+        future = compile_router.precompile_story("---\ntitle: Background\n---\n\n[[start]]\nQuiet.\n")
+        assert future is not None
+        errors, html = future.result(timeout=5)
+        assert errors == ()
+        assert "Background" in html
+
 class TestCORSHeaders:
     """Test CORS configuration."""
     
@@ -382,6 +807,20 @@ class TestErrorHandling:
         # Flask returns 400 for bad JSON
         assert response.status_code in [400, 415]
     
+    def test_oversize_body_rejected(self, client):
+        """Bodies over the 10 MB limit should get 413 without being saved."""
+        too_big = b"x" * (10 * 1024 * 1024 + 1)
+        response = client.post("/api/compile", data=too_big, content_type="application/json")
+        assert response.status_code == 413
+        
+        response = client.post(
+            "/api/save?filename=stream_save_story.txt",
+            data=too_big,
+            content_type="application/octet-stream"
+        )
+        assert response.status_code == 413
+        assert not list(STORIES_DIR.glob(".*.part"))
+    
     def test_missing_required_field_returns_error(self, client):
         """Missing required fields should return error."""
         response = client.post("/api/compile", json={"filename": "test.txt"})
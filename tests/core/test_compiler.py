@@ -373,6 +373,21 @@ title: Test
         assert len(errors) == 0
 
 
+    def test_long_chain_of_sections(self):
+        """Should validate a chain longer than the recursion limit."""
+        count = 2000
+        sections = []
+        for i in range(count):
+            choice = f"[[Next|s{i + 1}]]" if i + 1 < count else "The end."
+            sections.append(f"[[s{i}]]\n\n{choice}")
+        content = "---\ntitle: Long\n---\n\n" + "\n\n---\n\n".join(sections)
+        
+        compiler = StoryCompiler()
+        story = compiler.parse(content)
+        
+        assert len(story.sections) == count
+        assert compiler.validate(story) == []
+
 class TestErrorHandling:
     """Test error handling for malformed input."""
 
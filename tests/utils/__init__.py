@@ -0,0 +1 @@
+"""Tests for backend.utils helpers (file utils, compression)."""
@@ -0,0 +1,74 @@
+"""
+Tests for path validation and filename sanitization helpers.
+"""
+
+from pathlib import Path
+
+from backend.utils import is_safe_path, sanitize_filename
+
+
+class TestIsSafePath:
+    """Test directory traversal protection."""
+
+    def test_plain_filename_is_safe(self, tmp_path):
+        """A plain filename should resolve inside the base directory."""
+        is_safe, path = is_safe_path(tmp_path, "story.txt")
+        assert is_safe is True
+        assert path == (tmp_path / "story.txt").resolve()
+
+    def test_parent_traversal_rejected(self, tmp_path):
+        """'..' segments should be rejected."""
+        assert is_safe_path(tmp_path, "../etc/passwd") == (False, Path())
+
+    def test_absolute_path_rejected(self, tmp_path):
+        """Absolute paths should be rejected."""
+        assert is_safe_path(tmp_path, "/etc/passwd") == (False, Path())
+
+    def test_hidden_subpath_rejected(self, tmp_path):
+        """Dot-prefixed path components should be rejected."""
+        assert is_safe_path(tmp_path, "sub/.hidden")[0] is False
+
+    def test_sibling_with_common_prefix_rejected(self, tmp_path):
+        """A symlink into a sibling directory sharing the base's prefix is rejected."""
+        base = tmp_path / "stories"
+        sibling = tmp_path / "stories_old"
+        base.mkdir()
+        sibling.mkdir()
+        (sibling / "secret.txt").write_text("hidden")
+        (base / "link").symlink_to(sibling)
+
+        assert is_safe_path(base, "link/secret.txt") == (False, Path())
+
+    def test_nul_byte_rejected(self, tmp_path):
+        """Embedded NUL bytes should be rejected."""
+        assert is_safe_path(tmp_path, "story\x00.txt") == (False, Path())
+
+    def test_repeated_calls_agree(self, tmp_path):
+        """Cached base resolution should not change the result."""
+        first = is_safe_path(tmp_path, "a.txt")
+        second = is_safe_path(tmp_path, "a.txt")
+        assert first == second
+
+
+class TestSanitizeFilename:
+    """Test filename sanitization."""
+
+    def test_spaces_replaced(self):
+        """Spaces should become underscores and .txt is appended."""
+        assert sanitize_filename("my story") == "my_story.txt"
+
+    def test_traversal_removed(self):
+        """Traversal sequences and separators should be neutralized."""
+        assert sanitize_filename("../../../etc/passwd") == "etc_passwd.txt"
+
+    def test_custom_extension(self):
+        """A custom extension should be kept."""
+        assert sanitize_filename("test.html", extension=".html") == "test.html"
+
+    def test_empty_uses_default(self):
+        """Empty input should fall back to the default name."""
+        assert sanitize_filename("") == "new_story.txt"
+
+    def test_unicode_replaced(self):
+        """Non-ASCII characters should be replaced."""
+        assert sanitize_filename("drágón") == "dr_g_n.txt"
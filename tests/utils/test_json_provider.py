@@ -0,0 +1,56 @@
+"""
+Tests for the optional orjson JSON provider.
+"""
+
+import json
+
+import pytest
+from flask import Flask, jsonify, request
+
+from backend.utils import OrjsonProvider, install_json_provider
+
+
+@pytest.fixture
+def app():
+    """A bare app using the orjson provider."""
+    app = Flask(__name__)
+    app.json = OrjsonProvider(app)
+
+    @app.route("/echo", methods=["POST"])
+    def echo():
+        return jsonify({"got": request.get_json(), "b": 1, "a": "é"})
+
+    return app
+
+
+class TestOrjsonProvider:
+    """Test that the provider is a drop-in for Flask's default."""
+
+    def test_round_trip(self, app):
+        """Request bodies are parsed and responses serialized."""
+        response = app.test_client().post("/echo", json={"title": "Dragon 🐉"})
+        assert response.status_code == 200
+        assert response.get_json() == {"got": {"title": "Dragon 🐉"}, "b": 1, "a": "é"}
+
+    def test_keys_sorted_like_default(self, app):
+        """Keys stay sorted, as with Flask's stdlib provider."""
+        response = app.test_client().post("/echo", json={})
+        assert list(json.loads(response.data)) == ["a", "b", "got"]
+
+    def test_invalid_json_is_bad_request(self, app):
+        """A malformed body gives 400, not a server error."""
+        response = app.test_client().post(
+            "/echo", data=b"{not json", content_type="application/json"
+        )
+        assert response.status_code == 400
+
+    def test_dumps_matches_stdlib(self, app):
+        """app.json.dumps output parses back to the same value."""
+        data = {"sections": [1, 2], "title": None}
+        assert json.loads(app.json.dumps(data)) == data
+
+    def test_installed_when_available(self):
+        """install_json_provider should switch an app to orjson."""
+        app = Flask(__name__)
+        install_json_provider(app)
+        assert isinstance(app.json, OrjsonProvider)